@@ -43,6 +43,30 @@ const defaultPipelines = [
   }
 ];
 
+const API_BASE_URL = 'http://localhost:5000';
+const POLL_INTERVAL_MS = 2000;
+const POLL_TIMEOUT_MS = 30 * 60 * 1000;
+
+// Poll a pipeline job while the backend answers 202 (still running).
+// Any other non-2xx answer (failed run, unknown/evicted job) stops polling
+// and is thrown so the caller can show it.
+const waitForJob = async (jobId) => {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+    const response = await fetch(`${API_BASE_URL}/results/${jobId}`);
+    if (response.status === 202) {
+      continue;
+    }
+    const body = await response.json().catch(() => ({}));
+    if (!response.ok) {
+      throw new Error(body.message || `Pipeline job failed (HTTP ${response.status})`);
+    }
+    return body;
+  }
+  throw new Error('Timed out waiting for the pipeline to finish');
+};
+
 const Dashboard = ({ onBack }) => {
   const [selectedPipeline, setSelectedPipeline] = useState(null);
   const [isRunning, setIsRunning] = useState(false);
@@ -69,15 +93,16 @@ const Dashboard = ({ onBack }) => {
     }, 1000);
 
     try {
-      // Call the backend start-signal endpoint
-      const response = await fetch('http://localhost:5000/start-signal', {
+      // Call the backend start-signal endpoint; the pipeline runs in the background
+      const response = await fetch(`${API_BASE_URL}/start-signal`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
         }
       });
 
-      const data = await response.json();
+      const accepted = await response.json();
+      const data = response.status === 202 ? await waitForJob(accepted.job_id) : accepted;
       
       clearInterval(timerInterval);
       setIsRunning(false);
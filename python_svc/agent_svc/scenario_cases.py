@@ -5,73 +5,154 @@ This service generates test cases based on the ETL analysis report.
 Test cases are categorized into:
 1. quality_check - SQL queries to validate loaded data quality
 2. scenario_check - End-to-end tests with data modifications
+
+Run standalone from the python_svc directory:
+    python -m agent_svc.scenario_cases
 """
 
+import argparse
+import asyncio
+import atexit
+import functools
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
-from utils.llm_svc import call_openai_llm
+from utils import json_io
+from utils.llm_svc import RETRYABLE_LLM_ERRORS, AsyncTokenBucket, astream_openai_llm
+from utils.llm_cache import CACHE_DIR, LLMCache, llm_cache_stats, make_cache_key
 
+logger = logging.getLogger(__name__)
 
-class ScenarioCasesGenerator:
-    """
-    Generates structured test cases from ETL analysis report.
-    """
+# Queue listener started by configure_logging(); None until an entry point calls it
+log_listener = None
 
-    def __init__(self, report_path: str = 'etl_analysis_report.md'):
-        """
-        Initialize the scenario cases generator.
-        
-        Args:
-            report_path: Path to the ETL analysis report markdown file
-        """
-        self.report_path = report_path
-        self.report_content = ""
-        self.test_cases = {
-            "metadata": {
-                "generated_at": "",
-                "pipeline_name": "Customer Data SCD Type 2 ETL",
-                "source_report": report_path,
-                "total_cases": 0,
-                "quality_checks": 0,
-                "scenario_checks": 0
-            },
-            "test_cases": []
-        }
 
-    def read_report(self):
-        """Read the ETL analysis report."""
-        print(f"\n{'='*60}")
-        print(f"Reading ETL Analysis Report")
-        print(f"{'='*60}")
-        
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        full_path = os.path.join(base_path, self.report_path)
+def configure_logging(level: int = logging.INFO):
+    """
+    Write generator progress to stdout through a queue drained by a listener
+    thread, so logging never blocks the generator's event loop. Called by
+    entry points (main.py, main()); importing this module installs nothing.
+
+    Args:
+        level: Level of this module's logger
+    """
+    global log_listener
+    if log_listener is None:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+        log_listener.start()
+        atexit.register(log_listener.stop)
+    logger.setLevel(level)
+
+# Section banner
+BAR = '=' * 60
+
+# python_svc directory, which holds the report and generated test cases
+_BASE_PATH = Path(__file__).resolve().parent.parent
+
+# Fields every generated test case must provide, per kind
+_REQUIRED_FIELDS = {
+    "quality_checks": ("test_id", "test_name", "test_type", "sql_query"),
+    "scenario_checks": ("test_id", "test_name", "test_type", "input_data"),
+}
+
+if msgspec is not None:
+    class QualityCheck(msgspec.Struct, omit_defaults=True):
+        """Schema of a generated quality_check test case."""
+        test_id: str
+        test_name: str
+        test_type: str
+        sql_query: str
+        test_description: str = ""
+        expected_result: Any = None
+        expected_counts: Optional[List[int]] = None
+        severity: str = "medium"
+
+    class ScenarioCheck(msgspec.Struct, omit_defaults=True):
+        """Schema of a generated scenario_check test case."""
+        test_id: str
+        test_name: str
+        test_type: str
+        input_data: List[Dict[str, Any]]
+        validation_queries: List[str] = msgspec.field(default_factory=list)
+        test_description: str = ""
+        expected_outcome: Any = None
+        expected_counts: Optional[List[int]] = None
+        severity: str = "medium"
+
+    _CASE_TYPES = {"quality_checks": QualityCheck, "scenario_checks": ScenarioCheck}
+
+
+def _validate_cases(cases: List[Any], key: str) -> List[Dict]:
+    """
+    Check generated test cases against their schema.
+    Uses typed msgspec structs when available, otherwise checks required fields.
+    
+    Args:
+        cases: Parsed test cases
+        key: Kind of test cases ("quality_checks" or "scenario_checks")
         
-        with open(full_path, 'r', encoding='utf-8') as file:
-            self.report_content = file.read()
+    Returns:
+        Validated test cases as plain dictionaries
         
-        print(f"  ✓ Report loaded: {full_path}")
-        print(f"  ✓ Content length: {len(self.report_content)} characters")
-
-    def generate_quality_check_cases(self):
-        """Generate quality check test cases using LLM."""
-        print(f"\n{'='*60}")
-        print(f"Generating Quality Check Test Cases")
-        print(f"{'='*60}")
-
-        prompt = f"""
-Based on the following ETL analysis report, generate data quality test cases as SQL queries.
-
-{self.report_content[:4000]}
-
-Generate 10-12 quality check test cases that validate:
+    Raises:
+        ValueError: If a test case does not match the schema
+    """
+    if msgspec is not None:
+        try:
+            structs = msgspec.convert(cases, type=List[_CASE_TYPES[key]])
+        except msgspec.ValidationError as e:
+            raise ValueError(str(e)) from e
+        return msgspec.to_builtins(structs)
+    
+    for i, case in enumerate(cases):
+        if not isinstance(case, dict):
+            raise ValueError(f"Expected an object at $[{i}]")
+        missing = [field for field in _REQUIRED_FIELDS[key] if field not in case]
+        if missing:
+            raise ValueError(f"Object missing required fields {missing} at $[{i}]")
+    return cases
+
+
+# Transient LLM failures are retried with exponential backoff before
+# falling back to the default test cases
+LLM_MAX_ATTEMPTS = 4
+LLM_BACKOFF_MAX_SECONDS = 30
+
+# Only the head of the report is sent to the LLM
+REPORT_EXCERPT_CHARS = 4000
+
+# Parsed test cases keyed on the report excerpt, so edits past the excerpt
+# (e.g. trailing stats) still reuse the previous generation
+CASES_CACHE = LLMCache(os.path.join(CACHE_DIR, 'scenario_cases.db'))
+CASES_MODEL = "gpt-4o-mini"
+
+# Bump to invalidate cached test cases (prompt edits are picked up automatically)
+CASES_CACHE_VERSION = 1
+
+# Generation prompt, filled in with the report excerpt. Both test case kinds
+# are requested in one JSON-mode call, as arrays under their own keys.
+_CASES_PROMPT = """
+Based on the following ETL analysis report, generate data quality test cases as SQL queries
+and end-to-end scenario test cases.
+
+{excerpt}
+
+QUALITY CHECKS: Generate 10-12 quality check test cases that validate:
 1. Data completeness (all records loaded)
 2. Data integrity (primary keys, foreign keys)
 3. NULL value checks in required fields
@@ -80,7 +161,7 @@ Generate 10-12 quality check test cases that validate:
 6. Data type validations
 7. Business rule validations
 
-For EACH test case, provide:
+For EACH quality check, provide:
 - test_id: Unique identifier (e.g., "QC001", "QC002")
 - test_name: Descriptive name
 - test_description: What the test validates
@@ -89,49 +170,7 @@ For EACH test case, provide:
 - expected_result: What the query should return for a passing test
 - severity: "critical", "high", "medium", or "low"
 
-Return ONLY a valid JSON array of test case objects. No markdown, no explanation, just the JSON array.
-"""
-
-        try:
-            print("  ⏳ Calling OpenAI LLM to generate quality checks...")
-            response = call_openai_llm(prompt, model="gpt-4o-mini", max_tokens=2500, temperature=0.5)
-            
-            # Parse JSON response
-            # Remove markdown code blocks if present
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            quality_cases = json.loads(response)
-            
-            print(f"  ✓ Generated {len(quality_cases)} quality check cases")
-            return quality_cases
-            
-        except json.JSONDecodeError as e:
-            print(f"  ✗ JSON parsing error: {e}")
-            print(f"  Response: {response[:200]}...")
-            return self._generate_default_quality_checks()
-        except Exception as e:
-            print(f"  ✗ Error generating quality checks: {e}")
-            return self._generate_default_quality_checks()
-
-    def generate_scenario_check_cases(self):
-        """Generate scenario check test cases using LLM."""
-        print(f"\n{'='*60}")
-        print(f"Generating Scenario Check Test Cases")
-        print(f"{'='*60}")
-
-        prompt = f"""
-Based on the following ETL analysis report, generate end-to-end scenario test cases.
-
-{self.report_content[:4000]}
-
-Generate 8-10 scenario test cases that cover:
+SCENARIO CHECKS: Generate 8-10 scenario test cases that cover:
 1. New customer insertion
 2. Company name change (SCD Type 2)
 3. Name/email/phone change (SCD Type 1)
@@ -141,7 +180,7 @@ Generate 8-10 scenario test cases that cover:
 7. New customer + existing customer updates in same file
 8. Edge cases (empty values, special characters, etc.)
 
-For EACH test case, provide:
+For EACH scenario check, provide:
 - test_id: Unique identifier (e.g., "SC001", "SC002")
 - test_name: Descriptive name
 - test_description: What the scenario tests
@@ -151,281 +190,398 @@ For EACH test case, provide:
 - validation_queries: Array of SQL queries to validate the outcome
 - severity: "critical", "high", "medium", or "low"
 
-Return ONLY a valid JSON array of test case objects. No markdown, no explanation, just the JSON array.
+Return a JSON object of the form {{"quality_checks": [...], "scenario_checks": [...]}}.
 """
-
-        try:
-            print("  ⏳ Calling OpenAI LLM to generate scenario checks...")
-            response = call_openai_llm(prompt, model="gpt-4o-mini", max_tokens=3000, temperature=0.5)
-            
-            # Parse JSON response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            scenario_cases = json.loads(response)
-            
-            print(f"  ✓ Generated {len(scenario_cases)} scenario check cases")
-            return scenario_cases
-            
-        except json.JSONDecodeError as e:
-            print(f"  ✗ JSON parsing error: {e}")
-            print(f"  ℹ Using default scenario checks instead")
-            return self._generate_default_scenario_checks()
-        except KeyboardInterrupt:
-            print(f"  ⚠ Operation interrupted by user")
-            print(f"  ℹ Using default scenario checks instead")
-            return self._generate_default_scenario_checks()
-        except Exception as e:
-            print(f"  ✗ Error generating scenario checks: {e}")
-            print(f"  ℹ Using default scenario checks instead")
-            return self._generate_default_scenario_checks()
-
-    def _generate_default_quality_checks(self):
-        """Generate default quality check test cases as fallback."""
-        return [
-            {
-                "test_id": "QC001",
-                "test_name": "Verify Total Record Count",
-                "test_description": "Ensure all records from source are loaded into target table",
-                "test_type": "quality_check",
-                "sql_query": "SELECT COUNT(*) as total_records FROM dim_customer;",
-                "expected_result": "Should return count matching source data records",
-                "severity": "critical"
-            },
-            {
-                "test_id": "QC002",
-                "test_name": "Validate One Current Record Per Customer",
-                "test_description": "Ensure only one record has is_current=TRUE for each customer_id",
-                "test_type": "quality_check",
-                "sql_query": "SELECT customer_id, COUNT(*) as current_count FROM dim_customer WHERE is_current = TRUE GROUP BY customer_id HAVING COUNT(*) > 1;",
-                "expected_result": "Should return 0 rows (no duplicates)",
-                "severity": "critical"
-            },
+_CASES_TEMPLATE_KEY = make_cache_key(_CASES_PROMPT)
+
+
+# Fallback test cases used when LLM generation fails (built once at import)
+_DEFAULT_QC = (
+    {
+        "test_id": "QC001",
+        "test_name": "Verify Total Record Count",
+        "test_description": "Ensure all records from source are loaded into target table",
+        "test_type": "quality_check",
+        "sql_query": "SELECT COUNT(*) as total_records FROM dim_customer;",
+        "expected_result": "Should return count matching source data records",
+        "severity": "critical"
+    },
+    {
+        "test_id": "QC002",
+        "test_name": "Validate One Current Record Per Customer",
+        "test_description": "Ensure only one record has is_current=TRUE for each customer_id",
+        "test_type": "quality_check",
+        "sql_query": "SELECT customer_id, COUNT(*) as current_count FROM dim_customer WHERE is_current = TRUE GROUP BY customer_id HAVING COUNT(*) > 1;",
+        "expected_result": "Should return 0 rows (no duplicates)",
+        "severity": "critical"
+    },
+    {
+        "test_id": "QC003",
+        "test_name": "Check NULL Values in Required Fields",
+        "test_description": "Validate no NULL values in customer_id, effective_start_date, is_current",
+        "test_type": "quality_check",
+        "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE customer_id IS NULL OR effective_start_date IS NULL OR is_current IS NULL;",
+        "expected_result": "Should return 0",
+        "severity": "critical"
+    },
+    {
+        "test_id": "QC004",
+        "test_name": "Verify Temporal Consistency",
+        "test_description": "Check that effective_end_date > effective_start_date for expired records",
+        "test_type": "quality_check",
+        "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE effective_end_date IS NOT NULL AND effective_end_date <= effective_start_date;",
+        "expected_result": "Should return 0",
+        "severity": "high"
+    },
+    {
+        "test_id": "QC005",
+        "test_name": "Validate Current Records Have NULL End Date",
+        "test_description": "Ensure all current records have effective_end_date as NULL",
+        "test_type": "quality_check",
+        "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE is_current = TRUE AND effective_end_date IS NOT NULL;",
+        "expected_result": "Should return 0",
+        "severity": "critical"
+    }
+)
+
+_DEFAULT_SC = (
+    {
+        "test_id": "SC001",
+        "test_name": "New Customer Insertion",
+        "test_description": "Test insertion of a brand new customer record",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "QC003",
-                "test_name": "Check NULL Values in Required Fields",
-                "test_description": "Validate no NULL values in customer_id, effective_start_date, is_current",
-                "test_type": "quality_check",
-                "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE customer_id IS NULL OR effective_start_date IS NULL OR is_current IS NULL;",
-                "expected_result": "Should return 0",
-                "severity": "critical"
-            },
-            {
-                "test_id": "QC004",
-                "test_name": "Verify Temporal Consistency",
-                "test_description": "Check that effective_end_date > effective_start_date for expired records",
-                "test_type": "quality_check",
-                "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE effective_end_date IS NOT NULL AND effective_end_date <= effective_start_date;",
-                "expected_result": "Should return 0",
-                "severity": "high"
-            },
-            {
-                "test_id": "QC005",
-                "test_name": "Validate Current Records Have NULL End Date",
-                "test_description": "Ensure all current records have effective_end_date as NULL",
-                "test_type": "quality_check",
-                "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE is_current = TRUE AND effective_end_date IS NOT NULL;",
-                "expected_result": "Should return 0",
-                "severity": "critical"
+                "customer_id": "C999",
+                "first_name": "Test",
+                "last_name": "User",
+                "email": "test.user@email.com",
+                "company_name": "Test Company",
+                "phone": "555-9999"
             }
-        ]
-
-    def _generate_default_scenario_checks(self):
-        """Generate default scenario check test cases as fallback."""
-        return [
+        ],
+        "expected_outcome": "One new record inserted with is_current=TRUE, effective_end_date=NULL",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C999' AND is_current=TRUE;",
+            "SELECT effective_end_date FROM dim_customer WHERE customer_id='C999' AND is_current=TRUE;"
+        ],
+        "severity": "critical"
+    },
+    {
+        "test_id": "SC002",
+        "test_name": "Company Name Change (SCD Type 2)",
+        "test_description": "Test SCD Type 2 behavior when company_name changes",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC001",
-                "test_name": "New Customer Insertion",
-                "test_description": "Test insertion of a brand new customer record",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C999",
-                        "first_name": "Test",
-                        "last_name": "User",
-                        "email": "test.user@email.com",
-                        "company_name": "Test Company",
-                        "phone": "555-9999"
-                    }
-                ],
-                "expected_outcome": "One new record inserted with is_current=TRUE, effective_end_date=NULL",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C999' AND is_current=TRUE;",
-                    "SELECT effective_end_date FROM dim_customer WHERE customer_id='C999' AND is_current=TRUE;"
-                ],
-                "severity": "critical"
-            },
+                "customer_id": "C001",
+                "first_name": "John",
+                "last_name": "Doe",
+                "email": "john.doe@email.com",
+                "company_name": "New Company Inc",
+                "phone": "555-0101"
+            }
+        ],
+        "expected_outcome": "Old record expired (is_current=FALSE, end_date set), new record created (is_current=TRUE)",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001';",
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001' AND is_current=TRUE;",
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001' AND is_current=FALSE;"
+        ],
+        "severity": "critical"
+    },
+    {
+        "test_id": "SC003",
+        "test_name": "Type 1 Field Updates (Name/Email/Phone)",
+        "test_description": "Test SCD Type 1 updates without creating new versions",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC002",
-                "test_name": "Company Name Change (SCD Type 2)",
-                "test_description": "Test SCD Type 2 behavior when company_name changes",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C001",
-                        "first_name": "John",
-                        "last_name": "Doe",
-                        "email": "john.doe@email.com",
-                        "company_name": "New Company Inc",
-                        "phone": "555-0101"
-                    }
-                ],
-                "expected_outcome": "Old record expired (is_current=FALSE, end_date set), new record created (is_current=TRUE)",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001';",
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001' AND is_current=TRUE;",
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001' AND is_current=FALSE;"
-                ],
-                "severity": "critical"
-            },
+                "customer_id": "C002",
+                "first_name": "Janet",
+                "last_name": "Smith",
+                "email": "janet.smith@newemail.com",
+                "company_name": "MegaData Corp",
+                "phone": "555-0199"
+            }
+        ],
+        "expected_outcome": "Existing record updated in place, no new version created, same surrogate_key",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C002';",
+            "SELECT first_name, email FROM dim_customer WHERE customer_id='C002' AND is_current=TRUE;"
+        ],
+        "severity": "high"
+    },
+    {
+        "test_id": "SC004",
+        "test_name": "Combined Type 1 and Type 2 Changes",
+        "test_description": "Test when both Type 1 fields and company_name change simultaneously",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC003",
-                "test_name": "Type 1 Field Updates (Name/Email/Phone)",
-                "test_description": "Test SCD Type 1 updates without creating new versions",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C002",
-                        "first_name": "Janet",
-                        "last_name": "Smith",
-                        "email": "janet.smith@newemail.com",
-                        "company_name": "MegaData Corp",
-                        "phone": "555-0199"
-                    }
-                ],
-                "expected_outcome": "Existing record updated in place, no new version created, same surrogate_key",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C002';",
-                    "SELECT first_name, email FROM dim_customer WHERE customer_id='C002' AND is_current=TRUE;"
-                ],
-                "severity": "high"
-            },
+                "customer_id": "C003",
+                "first_name": "Mike",
+                "last_name": "Johnson",
+                "email": "mike.j@email.com",
+                "company_name": "NextGen Systems",
+                "phone": "555-0103"
+            }
+        ],
+        "expected_outcome": "Old record expired, new version created with both company and name changes",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C003';",
+            "SELECT company_name, first_name FROM dim_customer WHERE customer_id='C003' AND is_current=TRUE;"
+        ],
+        "severity": "critical"
+    },
+    {
+        "test_id": "SC005",
+        "test_name": "Unchanged Record Processing",
+        "test_description": "Test that unchanged records are not updated unnecessarily",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC004",
-                "test_name": "Combined Type 1 and Type 2 Changes",
-                "test_description": "Test when both Type 1 fields and company_name change simultaneously",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C003",
-                        "first_name": "Mike",
-                        "last_name": "Johnson",
-                        "email": "mike.j@email.com",
-                        "company_name": "NextGen Systems",
-                        "phone": "555-0103"
-                    }
-                ],
-                "expected_outcome": "Old record expired, new version created with both company and name changes",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C003';",
-                    "SELECT company_name, first_name FROM dim_customer WHERE customer_id='C003' AND is_current=TRUE;"
-                ],
-                "severity": "critical"
-            },
+                "customer_id": "C005",
+                "first_name": "David",
+                "last_name": "Brown",
+                "email": "david.b@email.com",
+                "company_name": "InnovateTech",
+                "phone": "555-0105"
+            }
+        ],
+        "expected_outcome": "No changes made, record count and updated_at remain the same",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C005';",
+            "SELECT is_current, effective_end_date FROM dim_customer WHERE customer_id='C005';"
+        ],
+        "severity": "medium"
+    },
+    {
+        "test_id": "SC006",
+        "test_name": "Multiple Customers in Single Load",
+        "test_description": "Test processing multiple customers with different change types in one load",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC005",
-                "test_name": "Unchanged Record Processing",
-                "test_description": "Test that unchanged records are not updated unnecessarily",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C005",
-                        "first_name": "David",
-                        "last_name": "Brown",
-                        "email": "david.b@email.com",
-                        "company_name": "InnovateTech",
-                        "phone": "555-0105"
-                    }
-                ],
-                "expected_outcome": "No changes made, record count and updated_at remain the same",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C005';",
-                    "SELECT is_current, effective_end_date FROM dim_customer WHERE customer_id='C005';"
-                ],
-                "severity": "medium"
+                "customer_id": "C001",
+                "first_name": "John",
+                "last_name": "Doe",
+                "email": "john.doe@email.com",
+                "company_name": "Super Tech Corp",
+                "phone": "555-0101"
             },
             {
-                "test_id": "SC006",
-                "test_name": "Multiple Customers in Single Load",
-                "test_description": "Test processing multiple customers with different change types in one load",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C001",
-                        "first_name": "John",
-                        "last_name": "Doe",
-                        "email": "john.doe@email.com",
-                        "company_name": "Super Tech Corp",
-                        "phone": "555-0101"
-                    },
-                    {
-                        "customer_id": "C888",
-                        "first_name": "Alice",
-                        "last_name": "Wonder",
-                        "email": "alice.w@email.com",
-                        "company_name": "Wonder Co",
-                        "phone": "555-0888"
-                    }
-                ],
-                "expected_outcome": "C001 gets new version (company change), C888 inserted as new customer",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001';",
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C888';",
-                    "SELECT is_current FROM dim_customer WHERE customer_id IN ('C001', 'C888');"
-                ],
-                "severity": "high"
-            },
+                "customer_id": "C888",
+                "first_name": "Alice",
+                "last_name": "Wonder",
+                "email": "alice.w@email.com",
+                "company_name": "Wonder Co",
+                "phone": "555-0888"
+            }
+        ],
+        "expected_outcome": "C001 gets new version (company change), C888 inserted as new customer",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C001';",
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C888';",
+            "SELECT is_current FROM dim_customer WHERE customer_id IN ('C001', 'C888');"
+        ],
+        "severity": "high"
+    },
+    {
+        "test_id": "SC007",
+        "test_name": "Sequential Company Changes",
+        "test_description": "Test multiple company changes for same customer over time",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC007",
-                "test_name": "Sequential Company Changes",
-                "test_description": "Test multiple company changes for same customer over time",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C004",
-                        "first_name": "Emily",
-                        "last_name": "Williams",
-                        "email": "emily.w@email.com",
-                        "company_name": "Ultimate Tech Solutions",
-                        "phone": "555-0104"
-                    }
-                ],
-                "expected_outcome": "Multiple versions exist, only latest is current, previous versions have sequential dates",
-                "validation_queries": [
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004';",
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004' AND is_current=TRUE;",
-                    "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004' AND is_current=FALSE;"
-                ],
-                "severity": "critical"
-            },
+                "customer_id": "C004",
+                "first_name": "Emily",
+                "last_name": "Williams",
+                "email": "emily.w@email.com",
+                "company_name": "Ultimate Tech Solutions",
+                "phone": "555-0104"
+            }
+        ],
+        "expected_outcome": "Multiple versions exist, only latest is current, previous versions have sequential dates",
+        "validation_queries": [
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004';",
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004' AND is_current=TRUE;",
+            "SELECT COUNT(*) FROM dim_customer WHERE customer_id='C004' AND is_current=FALSE;"
+        ],
+        "severity": "critical"
+    },
+    {
+        "test_id": "SC008",
+        "test_name": "Empty String Handling",
+        "test_description": "Test handling of empty or NULL-like values in input data",
+        "test_type": "scenario_check",
+        "input_data": [
             {
-                "test_id": "SC008",
-                "test_name": "Empty String Handling",
-                "test_description": "Test handling of empty or NULL-like values in input data",
-                "test_type": "scenario_check",
-                "input_data": [
-                    {
-                        "customer_id": "C777",
-                        "first_name": "Test",
-                        "last_name": "Empty",
-                        "email": "",
-                        "company_name": "Empty Test Corp",
-                        "phone": ""
-                    }
-                ],
-                "expected_outcome": "Record inserted with empty strings preserved (or handled per business rules)",
-                "validation_queries": [
-                    "SELECT email, phone FROM dim_customer WHERE customer_id='C777' AND is_current=TRUE;"
-                ],
-                "severity": "medium"
+                "customer_id": "C777",
+                "first_name": "Test",
+                "last_name": "Empty",
+                "email": "",
+                "company_name": "Empty Test Corp",
+                "phone": ""
             }
-        ]
+        ],
+        "expected_outcome": "Record inserted with empty strings preserved (or handled per business rules)",
+        "validation_queries": [
+            "SELECT email, phone FROM dim_customer WHERE customer_id='C777' AND is_current=TRUE;"
+        ],
+        "severity": "medium"
+    }
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_report_cached(path: str, mtime_ns: int) -> str:
+    """Read a report file; cached until its modification time changes."""
+    return Path(path).read_text(encoding='utf-8')
+
+
+class ScenarioCasesGenerator:
+    """
+    Generates structured test cases from ETL analysis report.
+    """
+
+    def __init__(self, report_path: str = 'etl_analysis_report.md', use_cache: bool = True,
+                 rate_limiter: Optional[AsyncTokenBucket] = None):
+        """
+        Initialize the scenario cases generator.
+        
+        Args:
+            report_path: Path to the ETL analysis report markdown file
+            use_cache: Reuse cached test cases for an unchanged report
+            rate_limiter: Optional request budget shared between generators
+        """
+        self.report_path = report_path
+        self.use_cache = use_cache
+        self.rate_limiter = rate_limiter
+        self.report_content = ""
+        self.report_excerpt = ""
+        self.cases_cache_key = ""
+        self.test_cases = {
+            "metadata": {
+                "generated_at": "",
+                "pipeline_name": "Customer Data SCD Type 2 ETL",
+                "source_report": report_path,
+                "total_cases": 0,
+                "quality_checks": 0,
+                "scenario_checks": 0
+            },
+            "test_cases": []
+        }
+
+    def read_report(self):
+        """Read the ETL analysis report."""
+        logger.info("\n%s\nReading ETL Analysis Report\n%s", BAR, BAR)
+        
+        full_path = _BASE_PATH / self.report_path
+        self.report_content = _read_report_cached(str(full_path), full_path.stat().st_mtime_ns)
+        self.report_excerpt = self.report_content[:REPORT_EXCERPT_CHARS]
+        self.cases_cache_key = make_cache_key({
+            'version': CASES_CACHE_VERSION,
+            'template': _CASES_TEMPLATE_KEY,
+            'model': CASES_MODEL,
+            'excerpt': make_cache_key(self.report_excerpt),
+        })
+        
+        logger.info("  ✓ Report loaded: %s", full_path)
+        logger.info("  ✓ Content length: %d characters", len(self.report_content))
+
+    async def _generate_all_cases(self) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Generate quality and scenario check test cases with a single LLM call.
+        Falls back to the default cases for any kind that could not be generated.
+        Successfully generated cases are cached per report excerpt.
+        
+        Returns:
+            Tuple of (quality_cases, scenario_cases)
+        """
+        logger.info("\n%s\nGenerating Quality and Scenario Check Test Cases\n%s", BAR, BAR)
+        
+        kinds = (
+            ("quality_checks", "qc_cases", "quality check", self._generate_default_quality_checks),
+            ("scenario_checks", "sc_cases", "scenario check", self._generate_default_scenario_checks),
+        )
+        
+        if self.use_cache:
+            cached = [CASES_CACHE.get(f"{self.cases_cache_key}:{cache_name}") for _, cache_name, _, _ in kinds]
+            if all(cases is not None for cases in cached):
+                for cases, (_, _, label, _) in zip(cached, kinds):
+                    logger.info("  ✓ Reusing %d cached %s cases", len(cases), label)
+                return cached[0], cached[1]
+        
+        prompt = _CASES_PROMPT.format(excerpt=self.report_excerpt)
+        generated = {}
+        for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+            generated = {}
+            response = ""
+            try:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire()
+                
+                logger.info("  ⏳ Calling OpenAI LLM to generate test cases...")
+                
+                # Each array is parsed as soon as it closes, while the rest streams in.
+                # Raw responses are not cached: only validated cases reach CASES_CACHE,
+                # so a truncated or invalid response is never replayed.
+                parser = json_io.JSONObjectStream()
+                async for chunk in astream_openai_llm(prompt, model=CASES_MODEL, max_tokens=5500,
+                                                      temperature=0.5, response_format={"type": "json_object"}):
+                    generated.update(parser.feed(chunk))
+                response = parser.text
+                
+                # Object never closed (e.g. truncated at max_tokens): let json report why
+                if not parser.done:
+                    generated = json.loads(response)
+                break
+                
+            except RETRYABLE_LLM_ERRORS + (json.JSONDecodeError,) as e:
+                if isinstance(e, json.JSONDecodeError):
+                    logger.error("  ✗ JSON parsing error: %s", e)
+                    logger.error("  Response: %s...", response[:200])
+                else:
+                    logger.error("  ✗ Error generating test cases: %s", e)
+                if attempt == LLM_MAX_ATTEMPTS:
+                    logger.error("  ✗ Giving up after %d attempts", attempt)
+                    break
+                delay = min(LLM_BACKOFF_MAX_SECONDS, 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                logger.warning("  ⚠ Retrying in %.1fs (attempt %d/%d)", delay, attempt + 1, LLM_MAX_ATTEMPTS)
+                await asyncio.sleep(delay)
+            except KeyboardInterrupt:
+                logger.warning("  ⚠ Operation interrupted by user")
+                break
+            except Exception as e:
+                logger.error("  ✗ Error generating test cases: %s", e)
+                break
+        
+        results = []
+        for key, cache_name, label, defaults_fn in kinds:
+            cases = generated.get(key) if isinstance(generated, dict) else None
+            if isinstance(cases, list) and cases:
+                try:
+                    cases = _validate_cases(cases, key)
+                except ValueError as e:
+                    logger.error("  ✗ Invalid %s cases: %s", label, e)
+                    cases = None
+            if isinstance(cases, list) and cases:
+                logger.info("  ✓ Generated %d %s cases", len(cases), label)
+                CASES_CACHE.set(f"{self.cases_cache_key}:{cache_name}", cases)
+            else:
+                logger.warning("  ℹ Using default %ss instead", label)
+                cases = defaults_fn()
+            results.append(cases)
+        return results[0], results[1]
+
+    def _generate_default_quality_checks(self):
+        """Generate default quality check test cases as fallback."""
+        return list(_DEFAULT_QC)
+
+    def _generate_default_scenario_checks(self):
+        """Generate default scenario check test cases as fallback."""
+        return list(_DEFAULT_SC)
 
     def combine_and_save_test_cases(self, quality_cases: List[Dict], scenario_cases: List[Dict], output_file: str = 'test_cases.json'):
         """
@@ -436,9 +592,7 @@ Return ONLY a valid JSON array of test case objects. No markdown, no explanation
             scenario_cases: List of scenario check test cases
             output_file: Output JSON file name
         """
-        print(f"\n{'='*60}")
-        print(f"Combining and Saving Test Cases")
-        print(f"{'='*60}")
+        logger.info("\n%s\nCombining and Saving Test Cases\n%s", BAR, BAR)
 
         # Update metadata
         self.test_cases['metadata']['generated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -450,62 +604,117 @@ Return ONLY a valid JSON array of test case objects. No markdown, no explanation
         self.test_cases['test_cases'] = quality_cases + scenario_cases
 
         # Save to file
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        output_path = os.path.join(base_path, output_file)
+        output_path = str(_BASE_PATH / output_file)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.test_cases, f, indent=2, ensure_ascii=False)
+        json_io.dump_to_file(self.test_cases, output_path, indent=True)
 
-        print(f"  ✓ Test cases saved to: {output_path}")
-        print(f"  ✓ Total test cases: {self.test_cases['metadata']['total_cases']}")
-        print(f"    - Quality checks: {self.test_cases['metadata']['quality_checks']}")
-        print(f"    - Scenario checks: {self.test_cases['metadata']['scenario_checks']}")
+        metadata = self.test_cases['metadata']
+        logger.info("  ✓ Test cases saved to: %s", output_path)
+        logger.info("  ✓ Total test cases: %d", metadata['total_cases'])
+        logger.info("    - Quality checks: %d", metadata['quality_checks'])
+        logger.info("    - Scenario checks: %d", metadata['scenario_checks'])
 
         return output_path
 
     def generate_test_cases(self, output_file: str = 'test_cases.json'):
         """
         Execute the complete test case generation pipeline.
+        Synchronous wrapper around agenerate_test_cases.
         
         Args:
             output_file: Output JSON file name
         """
-        print("\n" + "="*60)
-        print("SCENARIO CASES GENERATOR")
-        print("="*60)
+        return asyncio.run(self.agenerate_test_cases(output_file))
+
+    async def agenerate_test_cases(self, output_file: str = 'test_cases.json'):
+        """
+        Execute the complete test case generation pipeline.
+        
+        Args:
+            output_file: Output JSON file name
+        """
+        logger.info("\n%s\nSCENARIO CASES GENERATOR\n%s", BAR, BAR)
 
         try:
             # Step 1: Read analysis report
             self.read_report()
 
-            # Step 2: Generate quality check cases
-            quality_cases = self.generate_quality_check_cases()
-
-            # Step 3: Generate scenario check cases
-            scenario_cases = self.generate_scenario_check_cases()
+            # Steps 2-3: Generate quality and scenario check cases in one LLM call
+            quality_cases, scenario_cases = await self._generate_all_cases()
 
             # Step 4: Combine and save
             output_path = self.combine_and_save_test_cases(quality_cases, scenario_cases, output_file)
 
-            print("\n" + "="*60)
-            print("✓ TEST CASE GENERATION COMPLETE!")
-            print("="*60)
-            print(f"\nTest cases file: {output_path}")
-            print("\nNext Steps:")
-            print("  1. Review the generated test cases")
-            print("  2. Modify or add custom test cases if needed")
-            print("  3. Use execution service to run the tests")
+            logger.info("\n%s\n✓ TEST CASE GENERATION COMPLETE!\n%s", BAR, BAR)
+            logger.info("\nTest cases file: %s", output_path)
+            logger.info("\nNext Steps:\n"
+                        "  1. Review the generated test cases\n"
+                        "  2. Modify or add custom test cases if needed\n"
+                        "  3. Use execution service to run the tests")
+            
+            for cache_name, stats in llm_cache_stats().items():
+                if stats['hits'] or stats['misses']:
+                    logger.info("\nLLM cache %s: %d hits, %d misses (%.0f%% hit rate)",
+                                cache_name, stats['hits'], stats['misses'], stats['hit_rate'] * 100)
 
             return output_path
 
         except Exception as e:
-            print(f"\n✗ Error during test case generation: {e}")
+            logger.error("\n✗ Error during test case generation: %s", e)
             raise
 
 
+async def generate_many(report_paths: List[str], *, max_concurrent: int = 10,
+                        max_requests_per_minute: Optional[float] = None,
+                        use_cache: bool = True) -> List[Optional[str]]:
+    """
+    Generate test cases for several reports concurrently.
+    Each report is written to <report name>_test_cases.json.
+    
+    Args:
+        report_paths: Report paths, relative to python_svc
+        max_concurrent: Maximum number of reports processed at once
+        max_requests_per_minute: Optional OpenAI request budget shared by all reports
+        use_cache: Reuse cached test cases for unchanged reports
+        
+    Returns:
+        Output path per report (None where generation failed), in input order
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    rate_limiter = AsyncTokenBucket(max_requests_per_minute) if max_requests_per_minute else None
+    
+    async def run_one(report_path: str) -> Optional[str]:
+        generator = ScenarioCasesGenerator(report_path, use_cache=use_cache, rate_limiter=rate_limiter)
+        output_file = os.path.splitext(report_path)[0] + '_test_cases.json'
+        async with semaphore:
+            try:
+                return await generator.agenerate_test_cases(output_file)
+            except Exception as e:
+                logger.error("✗ %s: %s", report_path, e)
+                return None
+    
+    return await asyncio.gather(*(run_one(path) for path in report_paths))
+
+
 def main():
     """Main entry point for the scenario cases generator."""
-    generator = ScenarioCasesGenerator()
+    parser = argparse.ArgumentParser(description="Generate test cases from the ETL analysis report")
+    parser.add_argument('reports', nargs='*', help="Report paths (default: etl_analysis_report.md)")
+    parser.add_argument('--no-cache', action='store_true', help="Always call the LLM, ignoring cached test cases")
+    parser.add_argument('--max-concurrent', type=int, default=10, help="Reports processed at once")
+    parser.add_argument('--max-rpm', type=float, default=None, help="OpenAI requests per minute across all reports")
+    parser.add_argument('--quiet', action='store_true', help="Only log warnings and errors")
+    args = parser.parse_args()
+    
+    configure_logging(logging.WARNING if args.quiet else logging.INFO)
+    
+    if len(args.reports) > 1:
+        asyncio.run(generate_many(args.reports, max_concurrent=args.max_concurrent,
+                                  max_requests_per_minute=args.max_rpm, use_cache=not args.no_cache))
+        return
+    
+    report_path = args.reports[0] if args.reports else 'etl_analysis_report.md'
+    generator = ScenarioCasesGenerator(report_path, use_cache=not args.no_cache)
     generator.generate_test_cases()
 
 
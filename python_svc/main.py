@@ -7,26 +7,71 @@ This Flask service orchestrates the automated testing pipeline:
 3. Execution - Runs test cases and produces results
 
 Endpoints:
-- POST /start-signal - Receives start signal from frontend and executes all pipeline steps
+- POST /start-signal - Receives start signal from frontend and starts all pipeline steps in the background
+- GET /results/<job_id> - Get the status or outcome of a pipeline run
 - GET /results - Get the latest test results
 - GET /connections - Get all connections
 - POST /connections - Create a new connection
+
+Running:
+- Development: python main.py (Werkzeug server; FLASK_DEBUG=1 enables the reloader/debugger)
+- Production: gunicorn -w 1 --threads 8 -b 0.0.0.0:5000 main:app
+  Pipeline jobs live in this process (JOBS), so use a single worker with
+  threads; /results/<job_id> would miss jobs started in another worker.
+- CORS is handled in-process by flask-cors for the dashboard dev server.
+  Behind a reverse proxy that adds the CORS headers, set FLASK_CORS=0 to
+  skip the middleware, e.g. for nginx:
+      add_header 'Access-Control-Allow-Origin' '$http_origin' always;
+      if ($request_method = OPTIONS) { return 204; }
 """
 
+import asyncio
 import os
-import json
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict
 from flask import Flask, jsonify, request
-from flask_cors import CORS
+from flask.json.provider import JSONProvider
+
+from utils import json_io
 
 # Import pipeline components
+from agent_svc import execution, scenario_cases
 from agent_svc.test_planner import TestPlanner
 from agent_svc.scenario_cases import ScenarioCasesGenerator
-from agent_svc.execution import TestExecutionAgent
+from agent_svc.execution import TestExecutionAgent, results_metadata_path
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by json_io (orjson when installed), so
+    jsonify() and request.get_json() skip the stdlib encoder.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize an object to a JSON string."""
+        return json_io.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from bytes or str."""
+        return json_io.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response from the encoded bytes, without a str round-trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_io.dumps(obj), mimetype='application/json')
+
 
 app = Flask(__name__)
-CORS(app)
+app.json = ORJSONProvider(app)
+
+# flask-cors runs on every request; FLASK_CORS=0 leaves CORS to the proxy
+if os.environ.get('FLASK_CORS', '1') != '0':
+    from flask_cors import CORS
+    CORS(app)
 
 # Base path for file operations
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -34,86 +79,204 @@ BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 # Connections storage file
 CONNECTIONS_FILE = os.path.join(BASE_PATH,'temp_artifacts', 'connections.json')
 
+# (file signature, parsed connections) of the last read or write
+_connections_cache = (None, [])
+
+# Pipeline progress is written to stdout by the agents' own handlers
+scenario_cases.configure_logging()
+execution.configure_logging()
+
+# Pipeline components are built once and reused by every /start-signal.
+# They hold per-run state, so runs are serialized through PIPELINE_LOCK.
+PLANNER = TestPlanner()
+GENERATOR = ScenarioCasesGenerator()
+AGENT = TestExecutionAgent()
+AGENT.use_llm_planning = False
+PIPELINE_LOCK = threading.Lock()
+
+# Pipeline runs execute off the request thread; clients poll /results/<job_id>
+EXECUTOR = ThreadPoolExecutor(max_workers=2)
+# Most recent jobs, oldest first; finished jobs beyond MAX_JOBS are evicted
+MAX_JOBS = int(os.environ.get('PIPELINE_JOB_HISTORY', '20'))
+JOBS: Dict[str, Future] = OrderedDict()
+JOBS_LOCK = threading.Lock()
+
 
 def get_timestamp():
     """Get current timestamp string."""
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+def json_response(payload, status: int = 200):
+    """
+    Build a JSON response with json_io (orjson when installed) and an
+    explicit status code.
+
+    Args:
+        payload: JSON-serializable response body
+        status: HTTP status code
+
+    Returns:
+        Flask response object
+    """
+    return app.response_class(json_io.dumps(payload), status=status, mimetype='application/json')
+
+
+def _file_signature(path):
+    """Return (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def load_connections():
-    """Load connections from JSON file."""
-    if os.path.exists(CONNECTIONS_FILE):
-        with open(CONNECTIONS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    """
+    Load connections from JSON file.
+    The parsed list is kept in memory and re-read only when the file changes.
+    """
+    global _connections_cache
+    signature = _file_signature(CONNECTIONS_FILE)
+    if signature is None:
+        return []
+    cached_signature, cached = _connections_cache
+    if signature != cached_signature:
+        with open(CONNECTIONS_FILE, 'rb') as f:
+            cached = json_io.loads(f.read())
+        _connections_cache = (signature, cached)
+    # Callers append to the list before saving, so hand out a copy
+    return list(cached)
 
 
 def save_connections(connections):
-    """Save connections to JSON file."""
-    with open(CONNECTIONS_FILE, 'w') as f:
-        json.dump(connections, f, indent=2)
+    """Save connections to JSON file (atomic replace) and refresh the in-memory copy."""
+    global _connections_cache
+    json_io.dump_to_file(connections, CONNECTIONS_FILE, indent=True)
+    _connections_cache = (_file_signature(CONNECTIONS_FILE), list(connections))
+
+
+def _evict_finished_jobs():
+    """Drop the oldest finished jobs so at most MAX_JOBS are kept (caller holds JOBS_LOCK)."""
+    excess = len(JOBS) - MAX_JOBS
+    if excess <= 0:
+        return
+    for job_id in [job_id for job_id, future in JOBS.items() if future.done()][:excess]:
+        del JOBS[job_id]
+
+
+def run_pipeline():
+    """
+    Execute all pipeline steps on a fresh event loop (runs in an EXECUTOR thread).
+
+    Returns:
+        Response payload summarizing the run
+    """
+    with PIPELINE_LOCK:
+        return asyncio.run(arun_pipeline())
+
+
+async def arun_pipeline():
+    """
+    Execute all pipeline steps: Test Planner -> Scenario Generator -> Test Execution.
+    Each stage depends on the previous one, so stages are awaited in order;
+    the I/O inside each stage (DB, files, LLM calls) is awaited concurrently.
+
+    Returns:
+        Response payload summarizing the run
+    """
+    print("\n" + "="*70)
+    print("START SIGNAL RECEIVED FROM FRONTEND")
+    print("="*70)
+
+    # Step 1: Run Test Planner
+    print("\n[Step 1/3] Running Test Planner...")
+    report_path = await PLANNER.run_analysis_async()
+    print(f"  ✓ Analysis report generated: {report_path}")
+
+    # Step 2: Run Scenario Cases Generator
+    print("\n[Step 2/3] Running Scenario Cases Generator...")
+    test_cases_path = await GENERATOR.agenerate_test_cases()
+    print(f"  ✓ Test cases generated: {test_cases_path}")
+
+    # Step 3: Run Test Execution (thread-pooled DB work)
+    print("\n[Step 3/3] Running Test Execution Agent...")
+    results_path = await asyncio.to_thread(AGENT.run_all_tests)
+    print(f"  ✓ Test execution completed: {results_path}")
+
+    # Load only the metadata sidecar for the summary, not the full results
+    with open(results_metadata_path(results_path), 'rb') as f:
+        metadata = json_io.loads(f.read())
+
+    print("\n" + "="*70)
+    print("PIPELINE COMPLETED SUCCESSFULLY!")
+    print("="*70)
+
+    return {
+        "status": "success",
+        "message": "Pipeline executed successfully from start signal.",
+        "report_file": report_path,
+        "test_cases_file": test_cases_path,
+        "results_file": results_path,
+        "summary": {
+            "total_tests": metadata['total_tests'],
+            "passed": metadata['passed'],
+            "failed": metadata['failed'],
+            "errors": metadata['errors'],
+            "pass_rate": f"{(metadata['passed'] / metadata['total_tests'] * 100):.1f}%" if metadata['total_tests'] > 0 else "0%"
+        },
+        "timestamp": get_timestamp()
+    }
 
 
 @app.route('/start-signal', methods=['POST'])
 def start_signal():
     """
-    Receives a start signal from the frontend, executes all steps, and responds with a success message.
-    Executes: Test Planner -> Scenario Generator -> Test Execution
+    Receives a start signal from the frontend and starts the pipeline in the background.
+    Responds 202 Accepted with a job id to poll at /results/<job_id>.
     """
-    try:
-        print("\n" + "="*70)
-        print("START SIGNAL RECEIVED FROM FRONTEND")
-        print("="*70)
-        
-        # Step 1: Run Test Planner
-        print("\n[Step 1/3] Running Test Planner...")
-        planner = TestPlanner()
-        report_path = planner.run_analysis()
-        print(f"  ✓ Analysis report generated: {report_path}")
-
-        # Step 2: Run Scenario Cases Generator
-        print("\n[Step 2/3] Running Scenario Cases Generator...")
-        generator = ScenarioCasesGenerator()
-        test_cases_path = generator.generate_test_cases()
-        print(f"  ✓ Test cases generated: {test_cases_path}")
-
-        # Step 3: Run Test Execution
-        print("\n[Step 3/3] Running Test Execution Agent...")
-        agent = TestExecutionAgent()
-        agent.use_llm_planning = False
-        results_path = agent.run_all_tests()
-        print(f"  ✓ Test execution completed: {results_path}")
-
-        # Load results for summary
-        with open(results_path, 'r') as f:
-            results = json.load(f)
-
-        print("\n" + "="*70)
-        print("PIPELINE COMPLETED SUCCESSFULLY!")
-        print("="*70)
+    job_id = uuid.uuid4().hex
+    with JOBS_LOCK:
+        JOBS[job_id] = EXECUTOR.submit(run_pipeline)
+        _evict_finished_jobs()
+    return jsonify({
+        "status": "accepted",
+        "job_id": job_id,
+        "status_url": f"/results/{job_id}",
+        "timestamp": get_timestamp()
+    }), 202
+
 
+@app.route('/results/<job_id>', methods=['GET'])
+def get_job_result(job_id):
+    """
+    Get the status of a pipeline run, or its summary once it has finished.
+    """
+    with JOBS_LOCK:
+        future = JOBS.get(job_id)
+    if future is None:
         return jsonify({
-            "status": "success",
-            "message": "Pipeline executed successfully from start signal.",
-            "report_file": report_path,
-            "test_cases_file": test_cases_path,
-            "results_file": results_path,
-            "summary": {
-                "total_tests": results['metadata']['total_tests'],
-                "passed": results['metadata']['passed'],
-                "failed": results['metadata']['failed'],
-                "errors": results['metadata']['errors'],
-                "pass_rate": f"{(results['metadata']['passed'] / results['metadata']['total_tests'] * 100):.1f}%" if results['metadata']['total_tests'] > 0 else "0%"
-            },
-            "timestamp": get_timestamp()
-        })
-    except Exception as e:
+            "status": "error",
+            "message": f"Unknown or expired job id: {job_id}"
+        }), 404
+
+    if not future.done():
+        return jsonify({
+            "status": "running",
+            "job_id": job_id
+        }), 202
+
+    error = future.exception()
+    if error is not None:
         return jsonify({
             "status": "error",
-            "message": str(e),
+            "message": str(error),
+            "job_id": job_id,
             "timestamp": get_timestamp()
         }), 500
 
+    return json_response({**future.result(), "job_id": job_id})
+
 
 @app.route('/results', methods=['GET'])
 def get_results():
@@ -129,10 +292,10 @@ def get_results():
                 "message": "No test results found. Run the pipeline first."
             }), 404
         
-        with open(results_path, 'r') as f:
-            results = json.load(f)
+        with open(results_path, 'rb') as f:
+            results = json_io.loads(f.read())
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "results": results
         })
@@ -208,10 +371,13 @@ if __name__ == "__main__":
     print("Data Pipeline Testing Platform - API Service")
     print("="*60)
     print("\nAvailable Endpoints:")
-    print("  POST /start-signal    - Execute complete testing pipeline")
+    print("  POST /start-signal    - Start complete testing pipeline (returns a job id)")
+    print("  GET  /results/<job_id> - Get status/summary of a pipeline run")
     print("  GET  /results         - Get latest test results")
     print("  GET  /connections     - Get all connections")
     print("  POST /connections     - Create new connection")
     print("\n" + "="*60)
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server only; see the module docstring for the production command.
+    # The debug reloader is opt-in: FLASK_DEBUG=1 python main.py
+    app.run(host='0.0.0.0', port=5000, debug=bool(int(os.environ.get('FLASK_DEBUG', '0'))))
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os
+
+# utils.llm_svc builds its OpenAI client at import; these tests never call the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,150 @@
+import re
+from datetime import datetime
+
+import pytest
+
+from utils import customer_etl
+from utils.customer_etl import CustomerSCD2ETL
+
+ALICE = {
+    "customer_id": "C001",
+    "first_name": "Alice",
+    "last_name": "Smith",
+    "email": "alice@example.com",
+    "company_name": "Acme",
+    "phone": "555-0100",
+}
+STORED_ALICE = dict(ALICE, surrogate_key=7)
+LOAD_DATE = datetime(2024, 1, 31)
+
+
+@pytest.fixture
+def etl():
+    return CustomerSCD2ETL()
+
+
+def test_classify_new_customer_is_inserted(etl):
+    assert etl._classify(ALICE, None) == "inserted"
+
+
+def test_classify_unchanged_record(etl):
+    assert etl._classify(dict(ALICE), dict(ALICE, surrogate_key=1)) == "unchanged"
+
+
+def test_classify_company_change_is_scd2(etl):
+    # A tracked change wins even when Type 1 fields changed too
+    source = dict(ALICE, company_name="Globex", email="alice@globex.com")
+    assert etl._classify(source, ALICE) == "updated_scd2"
+
+
+@pytest.mark.parametrize("field", ["first_name", "last_name", "email", "phone"])
+def test_classify_type1_change_is_scd1(etl, field):
+    assert etl._classify(dict(ALICE, **{field: "changed"}), ALICE) == "updated_scd1"
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def row_load(etl, monkeypatch):
+    """Run _load_rows against a fixed snapshot, capturing the batched writes by statement."""
+    batches = {}
+    monkeypatch.setattr(customer_etl, "prepare_statements", lambda cursor, statements: set(statements))
+    monkeypatch.setattr(customer_etl, "execute_batch",
+                        lambda cursor, sql, rows, page_size: batches.setdefault(sql.split()[1], []).extend(rows))
+    etl.conn = FakeConnection()
+
+    def run(records, snapshot=(), commit=True):
+        etl._load_current_snapshot = lambda customer_ids: {row["customer_id"]: dict(row) for row in snapshot}
+        stats = etl._load_rows(records, LOAD_DATE, commit=commit)
+        return stats, batches
+
+    return run
+
+
+
+def test_load_rows_writes_new_and_changed_customers(row_load, etl):
+    bob = dict(ALICE, customer_id="C002", first_name="Bob")
+    stats, batches = row_load([dict(ALICE, company_name="Globex"), bob], [STORED_ALICE])
+    assert stats == {"inserted": 1, "updated_scd2": 1, "updated_scd1": 0, "unchanged": 0}
+    assert batches["etl_expire_customer"] == [(LOAD_DATE, 7)]
+    assert batches["etl_insert_customer"] == [
+        ["C001", "Alice", "Smith", "alice@example.com", "Globex", "555-0100", LOAD_DATE, None, True],
+        ["C002", "Bob", "Smith", "alice@example.com", "Acme", "555-0100", LOAD_DATE, None, True],
+    ]
+    assert "etl_update_type1" not in batches
+    assert etl.conn.commits == 1
+    assert etl.last_stats == stats
+
+
+def test_load_rows_updates_stored_type1_fields_in_place(row_load):
+    stats, batches = row_load([dict(ALICE, email="a@example.com"), dict(ALICE, email="a@example.com", phone="555-0199")],
+                              [STORED_ALICE], commit=False)
+    assert stats == {"inserted": 0, "updated_scd2": 0, "updated_scd1": 2, "unchanged": 0}
+    # Only the latest Type 1 values per stored row are written
+    assert batches == {"etl_update_type1": [("Alice", "Smith", "a@example.com", "555-0199", 7)]}
+
+
+def test_load_rows_replays_repeated_customers_in_batch_order(row_load):
+    records = [
+        dict(ALICE, customer_id="C003", company_name="Initech"),
+        dict(ALICE, customer_id="C003", company_name="Initech", phone="555-0111"),
+        dict(ALICE, customer_id="C003", company_name="Umbrella"),
+        dict(ALICE, customer_id="C003", company_name="Umbrella"),
+    ]
+    stats, batches = row_load(records)
+    assert stats == {"inserted": 1, "updated_scd2": 1, "updated_scd1": 1, "unchanged": 1}
+    # The first version is new in this batch: its Type 1 update and expiry are
+    # folded into the pending insert instead of separate statements
+    assert batches == {"etl_insert_customer": [
+        ["C003", "Alice", "Smith", "alice@example.com", "Initech", "555-0111", LOAD_DATE, LOAD_DATE, False],
+        ["C003", "Alice", "Smith", "alice@example.com", "Umbrella", "555-0100", LOAD_DATE, None, True],
+    ]}
+
+
+class FakeStagingCursor:
+    """Answers merge_staging's duplicate check, staging read and merge with canned rows."""
+
+    def __init__(self, has_duplicates, rows):
+        self.has_duplicates, self.rows = has_duplicates, rows
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return (self.has_duplicates,)
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_merge_staging_query_labels_match_load_stats():
+    labels = re.findall(r"(?:THEN|ELSE) '(\w+)'", CustomerSCD2ETL.MERGE_STAGING_QUERY)
+    assert set(labels) == {"inserted", "updated_scd2", "updated_scd1", "unchanged"}
+
+
+def test_merge_staging_fills_missing_change_types_with_zero(etl):
+    etl.conn = FakeConnection()
+    etl.cursor = FakeStagingCursor(False, [("inserted", 3), ("updated_scd2", 1)])
+    stats = etl.merge_staging(LOAD_DATE)
+    assert stats == {"inserted": 3, "updated_scd2": 1, "updated_scd1": 0, "unchanged": 0}
+    assert etl.cursor.executed[-1] == (CustomerSCD2ETL.MERGE_STAGING_QUERY, {"load_date": LOAD_DATE})
+    assert etl.conn.commits == 1
+    assert etl.last_stats == stats
+
+
+def test_merge_staging_replays_repeated_customers_row_by_row(etl, monkeypatch):
+    staged = [tuple(ALICE[column] for column in CustomerSCD2ETL.SOURCE_COLUMNS),
+              tuple(dict(ALICE, company_name="Globex")[column] for column in CustomerSCD2ETL.SOURCE_COLUMNS)]
+    etl.cursor = FakeStagingCursor(True, staged)
+    calls = []
+    monkeypatch.setattr(etl, "_load_rows", lambda records, load_date, commit: calls.append((records, load_date, commit)))
+    etl.merge_staging(LOAD_DATE, commit=False)
+    assert calls == [([ALICE, dict(ALICE, company_name="Globex")], LOAD_DATE, False)]
+    assert all(query != CustomerSCD2ETL.MERGE_STAGING_QUERY for query, _ in etl.cursor.executed)
@@ -0,0 +1,74 @@
+import pytest
+
+from agent_svc import execution
+from utils.llm_cache import LLMCache, make_cache_key
+
+QUALITY_CASE = {
+    "test_id": "QC_001",
+    "test_name": "No NULL customer ids",
+    "test_type": "quality_check",
+    "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE customer_id IS NULL",
+    "expected_result": 0,
+}
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(execution, "PLAN_CACHE", LLMCache(str(tmp_path / "plans.db")))
+    monkeypatch.setattr(execution, "SEMANTIC_PLAN_CACHE_ENABLED", False)
+    agent = execution.TestExecutionAgent()
+    agent.use_llm_planning = True
+    return agent
+
+
+def test_lookup_plan_miss_returns_prompt_and_structural_key(agent):
+    plan, cache_key, prompt, embedding = agent._lookup_plan(QUALITY_CASE)
+    assert plan is None
+    assert embedding is None
+    assert prompt.startswith(execution.PLAN_PROMPT_PREFIX)
+    assert QUALITY_CASE["sql_query"] in prompt
+    assert cache_key == make_cache_key({
+        "version": execution.PLAN_CACHE_VERSION,
+        "prompt": make_cache_key(execution.PLAN_PROMPT_PREFIX),
+        "model": execution.PLAN_MODEL,
+        "test_type": "quality_check",
+        "sql_query": QUALITY_CASE["sql_query"],
+        "input_data": None,
+        "validation_queries": None,
+        "expected_result": 0,
+        "expected_outcome": None,
+    })
+
+
+def test_lookup_plan_key_ignores_test_id_but_not_test_type(agent):
+    _, key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    _, renamed_key, _, _ = agent._lookup_plan(dict(QUALITY_CASE, test_id="QC_999", test_name="Other"))
+    _, retyped_key, _, _ = agent._lookup_plan(dict(QUALITY_CASE, test_type="scenario_check"))
+    assert renamed_key == key
+    assert retyped_key != key
+
+
+def test_lookup_plan_key_changes_with_model_and_version(agent, monkeypatch):
+    _, key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    monkeypatch.setattr(execution, "PLAN_MODEL", "gpt-4o")
+    _, model_key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    monkeypatch.setattr(execution, "PLAN_CACHE_VERSION", execution.PLAN_CACHE_VERSION + 1)
+    _, version_key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    assert len({key, model_key, version_key}) == 3
+
+
+def test_stored_plan_is_reused_with_the_callers_test_id(agent):
+    _, cache_key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    response = '```json\n{"test_id": "QC_001", "execution_steps": []}\n```'
+    assert agent._store_plan(response, cache_key) == {"test_id": "QC_001", "execution_steps": []}
+
+    plan, _, prompt, _ = agent._lookup_plan(dict(QUALITY_CASE, test_id="QC_002"))
+    assert plan == {"test_id": "QC_002", "execution_steps": []}
+    assert prompt is None
+
+
+def test_prefetched_plan_wins_over_cache(agent):
+    _, cache_key, _, _ = agent._lookup_plan(QUALITY_CASE)
+    agent._prefetched_plans[cache_key] = {"test_id": "QC_001", "execution_steps": [{"step_number": 1}]}
+    plan, _, _, _ = agent._lookup_plan(QUALITY_CASE)
+    assert plan["execution_steps"] == [{"step_number": 1}]
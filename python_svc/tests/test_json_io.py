@@ -0,0 +1,76 @@
+import os
+from decimal import Decimal
+
+import pytest
+
+from utils import json_io
+
+
+def test_dumps_loads_round_trip():
+    payload = {"name": "Zoë", "items": [1, 2.5, None, True], "nested": {"a": "b"}}
+    data = json_io.dumps(payload)
+    assert isinstance(data, bytes)
+    assert json_io.loads(data) == payload
+    assert json_io.loads(data.decode("utf-8")) == payload
+
+
+def test_dumps_indent_and_fallback_to_str():
+    data = json_io.dumps({"amount": Decimal("1.50")}, indent=True)
+    assert b"\n  " in data
+    assert json_io.loads(data) == {"amount": "1.50"}
+
+
+def test_dump_to_file_replaces_target_without_leftovers(tmp_path):
+    path = str(tmp_path / "connections.json")
+    json_io.dump_to_file([{"id": 1}], path, indent=True)
+    json_io.dump_to_file([{"id": 2}], path)
+    with open(path, "rb") as f:
+        assert json_io.loads(f.read()) == [{"id": 2}]
+    assert os.listdir(tmp_path) == ["connections.json"]
+
+
+def test_dump_to_file_keeps_old_file_when_replace_fails(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.json")
+    json_io.dump_to_file({"run": 1}, path)
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json_io.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        json_io.dump_to_file({"run": 2}, path)
+    with open(path, "rb") as f:
+        assert json_io.loads(f.read()) == {"run": 1}
+
+
+def _feed_in_chunks(parser, text, size):
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(parser.feed(text[start:start + size]))
+    return members
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_array_stream_yields_every_item(size):
+    items = [{"test_id": "QC_001", "sql_query": "SELECT '}]'"}, {"test_id": "QC_002"}, "text", 42]
+    text = "```json\n" + json_io.dumps(items, indent=True).decode("utf-8") + "\n```"
+    parser = json_io.JSONArrayStream()
+    assert _feed_in_chunks(parser, text, size) == items
+    assert parser.done
+    assert parser.text == text
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_object_stream_yields_every_member(size):
+    document = {"quality_checks": [{"test_id": "QC_001"}], "scenario_checks": [], "count": 12}
+    text = json_io.dumps(document).decode("utf-8")
+    parser = json_io.JSONObjectStream()
+    assert dict(_feed_in_chunks(parser, text, size)) == document
+    assert parser.done
+
+
+def test_object_stream_reports_incomplete_document():
+    parser = json_io.JSONObjectStream()
+    members = parser.feed('{"quality_checks": [{"test_id": "QC_001"}], "scenario_checks": [{"test_')
+    assert members == [("quality_checks", [{"test_id": "QC_001"}])]
+    assert not parser.done
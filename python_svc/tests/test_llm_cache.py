@@ -0,0 +1,42 @@
+from utils import llm_cache
+from utils.llm_cache import LLMCache, make_cache_key
+
+
+def test_make_cache_key_is_deterministic_and_order_insensitive():
+    key = make_cache_key({"a": 1, "b": [1, 2]})
+    assert key == make_cache_key({"b": [1, 2], "a": 1})
+    assert len(key) == 64
+    assert key != make_cache_key({"a": 1, "b": [2, 1]})
+
+
+def test_cache_hit_miss_and_persistence(tmp_path):
+    db_path = str(tmp_path / "cache" / "plans.db")
+    cache = LLMCache(db_path)
+    assert cache.get("missing") is None
+    cache.set("key", {"steps": [1, 2]})
+    assert cache.get("key") == {"steps": [1, 2]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A new instance reads the value back from sqlite
+    reopened = LLMCache(db_path)
+    assert reopened.get("key") == {"steps": [1, 2]}
+    assert reopened.hits == 1
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / "lru.db"), maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert list(cache._memory) == ["a", "c"]
+    # Evicted entries are still served from the persistent tier
+    assert cache.get("b") == 2
+
+
+def test_disabled_cache_always_misses(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / "off.db"))
+    cache.set("key", "value")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DISABLED", True)
+    assert cache.get("key") is None
+    assert cache.misses == 1
@@ -0,0 +1,68 @@
+import psycopg2
+import pytest
+
+from agent_svc import test_planner
+
+
+class FakePool:
+    def __init__(self):
+        self.returned = []
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+class FakeConnection:
+    def __init__(self, closed=0, rollback_error=None):
+        self.closed = closed
+        self.rollback_error = rollback_error
+        self.rolled_back = False
+
+    def rollback(self):
+        if self.rollback_error:
+            # psycopg2 marks a connection closed once the server is gone
+            self.closed = 2
+            raise self.rollback_error
+        self.rolled_back = True
+
+
+class FakeCursor:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake_pool = FakePool()
+    monkeypatch.setattr(test_planner, "get_pool", lambda: fake_pool)
+    return fake_pool
+
+
+def _planner(conn):
+    planner = test_planner.TestPlanner(use_cache=False)
+    planner.conn, planner.cursor = conn, FakeCursor()
+    return planner
+
+
+def test_close_db_rolls_back_and_keeps_healthy_connection(pool):
+    conn = FakeConnection()
+    planner = _planner(conn)
+    planner.close_db()
+    assert conn.rolled_back
+    assert pool.returned == [(conn, False)]
+    assert planner.conn is None
+
+
+def test_close_db_discards_closed_connection_without_rollback(pool):
+    conn = FakeConnection(closed=1)
+    _planner(conn).close_db()
+    assert not conn.rolled_back
+    assert pool.returned == [(conn, True)]
+
+
+def test_close_db_releases_connection_when_rollback_fails(pool):
+    conn = FakeConnection(rollback_error=psycopg2.OperationalError("server closed the connection"))
+    planner = _planner(conn)
+    planner.close_db()
+    assert pool.returned == [(conn, True)]
+    assert planner.conn is None
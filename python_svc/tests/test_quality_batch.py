@@ -0,0 +1,100 @@
+import pytest
+
+from agent_svc import execution
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query):
+        self.conn.queries.append(query)
+        if self.conn.error:
+            raise self.conn.error
+
+    def fetchone(self):
+        return self.conn.row
+
+
+class FakeConnection:
+    def __init__(self, row, error=None):
+        self.row, self.error = row, error
+        self.queries = []
+        self.closed = 0
+        self.readonly = None
+
+    def rollback(self):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.returned = []
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+def _quality_case(test_id, sql_query, expected_result):
+    return {"test_id": test_id, "test_name": test_id, "test_type": "quality_check",
+            "sql_query": sql_query, "expected_result": expected_result}
+
+
+@pytest.fixture
+def run_batch(monkeypatch):
+    """Run _run_quality_batch against a fake read connection returning the given row."""
+    def run(indexed_cases, row, error=None):
+        pool = FakePool(FakeConnection(row, error))
+        monkeypatch.setattr(execution, "get_pool", lambda: pool)
+        return execution.TestExecutionAgent()._run_quality_batch(indexed_cases), pool
+    return run
+
+
+def test_json_agg_batch_selects_one_json_column_per_query():
+    sql = execution._json_agg_batch(["SELECT 1 AS a", "WITH t AS (SELECT 2) SELECT * FROM t -- trailing comment"])
+    assert sql.startswith("SELECT ") and sql.endswith(";")
+    assert "(SELECT COALESCE(json_agg(q0), '[]'::json) FROM (\nSELECT 1 AS a\n) AS q0) AS r0" in sql
+    # Bodies sit on their own lines, so a trailing comment cannot swallow the closing paren
+    assert "-- trailing comment\n) AS q1) AS r1" in sql
+
+
+def test_quality_batch_unpacks_one_result_set_per_case_in_order(run_batch):
+    cases = [(4, _quality_case("QC_001", "SELECT id FROM dim_customer WHERE email IS NULL;", 0)),
+             (9, _quality_case("QC_002", "select customer_id from dim_customer where is_current", 2))]
+    results, pool = run_batch(cases, ([], [{"customer_id": "C001"}]))
+    assert [index for index, _ in results] == [4, 9]
+    first, second = (result for _, result in results)
+    assert (first["test_id"], first["status"]) == ("QC_001", "passed")
+    assert (second["test_id"], second["status"]) == ("QC_002", "failed")
+    assert second["validation_message"] == "Failed: Expected 2, Got 1"
+    # Trailing semicolons are stripped before the bodies are wrapped
+    assert "WHERE email IS NULL\n) AS q0" in pool.conn.queries[-1]
+    assert pool.returned == [(pool.conn, False)]
+
+
+def test_quality_batch_skips_write_queries(run_batch):
+    cases = [(0, _quality_case("QC_001", "SELECT 1", 1)),
+             (1, _quality_case("QC_002", "DELETE FROM dim_customer", 0))]
+    results, pool = run_batch(cases, ([], []))
+    assert results == []
+    assert pool.returned == []
+
+
+def test_quality_batch_failure_releases_connection(run_batch):
+    cases = [(0, _quality_case("QC_001", "SELECT 1", 1))]
+    results, pool = run_batch(cases, None, error=RuntimeError("relation does not exist"))
+    assert results == []
+    assert pool.returned == [(pool.conn, False)]
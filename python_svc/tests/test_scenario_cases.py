@@ -0,0 +1,69 @@
+import pytest
+
+from agent_svc import scenario_cases
+from agent_svc.scenario_cases import ScenarioCasesGenerator
+
+
+def _cases_key(tmp_path, name, content):
+    report = tmp_path / name
+    report.write_text(content)
+    generator = ScenarioCasesGenerator(str(report))
+    generator.read_report()
+    return generator.cases_cache_key
+
+
+def test_cases_cache_key_covers_excerpt_prompt_model_and_version(tmp_path, monkeypatch):
+    key = _cases_key(tmp_path, "report.txt", "ETL report")
+    assert key == _cases_key(tmp_path, "copy.txt", "ETL report")
+    excerpt_key = _cases_key(tmp_path, "revised.txt", "ETL report, revised")
+    monkeypatch.setattr(scenario_cases, "_CASES_TEMPLATE_KEY", "edited prompt")
+    template_key = _cases_key(tmp_path, "report.txt", "ETL report")
+    monkeypatch.setattr(scenario_cases, "CASES_MODEL", "gpt-4o")
+    model_key = _cases_key(tmp_path, "report.txt", "ETL report")
+    monkeypatch.setattr(scenario_cases, "CASES_CACHE_VERSION", scenario_cases.CASES_CACHE_VERSION + 1)
+    version_key = _cases_key(tmp_path, "report.txt", "ETL report")
+    assert len({key, excerpt_key, template_key, model_key, version_key}) == 5
+
+
+def test_cases_cache_key_ignores_text_past_the_excerpt(tmp_path):
+    head = "x" * scenario_cases.REPORT_EXCERPT_CHARS
+    key = _cases_key(tmp_path, "report.txt", head + "trailing stats")
+    assert _cases_key(tmp_path, "other.txt", head + "other trailing stats") == key
+
+
+QUALITY = {"test_id": "QC_001", "test_name": "No NULL ids", "test_type": "quality_check",
+           "sql_query": "SELECT COUNT(*) FROM dim_customer WHERE customer_id IS NULL", "expected_result": 0}
+SCENARIO = {"test_id": "SC_001", "test_name": "Company change", "test_type": "scenario_check",
+            "input_data": [{"customer_id": "C001", "company_name": "Globex"}],
+            "validation_queries": ["SELECT COUNT(*) FROM dim_customer"], "expected_counts": [2]}
+
+
+@pytest.fixture(params=["msgspec", "required_fields"])
+def validate_cases(request, monkeypatch):
+    """_validate_cases with msgspec structs, and with the required-field fallback."""
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+    else:
+        monkeypatch.setattr(scenario_cases, "msgspec", None)
+    return scenario_cases._validate_cases
+
+
+def test_validate_cases_accepts_well_formed_cases(validate_cases):
+    assert validate_cases([QUALITY], "quality_checks")[0]["sql_query"] == QUALITY["sql_query"]
+    assert validate_cases([SCENARIO], "scenario_checks")[0]["input_data"] == SCENARIO["input_data"]
+
+
+@pytest.mark.parametrize("case, key", [
+    ({k: v for k, v in QUALITY.items() if k != "sql_query"}, "quality_checks"),
+    ({k: v for k, v in SCENARIO.items() if k != "input_data"}, "scenario_checks"),
+    # A quality check does not satisfy the scenario schema
+    (QUALITY, "scenario_checks"),
+])
+def test_validate_cases_rejects_missing_required_fields(validate_cases, case, key):
+    with pytest.raises(ValueError):
+        validate_cases([SCENARIO if key == "scenario_checks" else QUALITY, case], key)
+
+
+def test_validate_cases_rejects_non_objects(validate_cases):
+    with pytest.raises(ValueError):
+        validate_cases([QUALITY, "QC_002"], "quality_checks")
@@ -0,0 +1,60 @@
+import pytest
+
+from agent_svc import execution
+
+
+@pytest.fixture
+def agent():
+    return execution.TestExecutionAgent()
+
+
+def test_quality_check_compares_last_count(agent):
+    case = {"test_type": "quality_check", "expected_result": 2}
+    assert agent.validate_result([5, [{"id": 1}, {"id": 2}]], case)[0]
+    passed, message = agent.validate_result([2, 3], case)
+    assert not passed
+    assert message == "Failed: Expected 2, Got 3"
+
+
+def test_quality_check_expecting_zero_is_not_skipped(agent):
+    case = {"test_type": "quality_check", "expected_result": 0}
+    assert agent.validate_result([0], case) == (True, "Passed: Expected 0, Got 0")
+    assert agent.validate_result([[{"id": None}]], case) == (False, "Failed: Expected 0, Got 1")
+
+
+def test_quality_check_falls_back_to_expected_outcome(agent):
+    case = {"test_type": "quality_check", "expected_outcome": 1}
+    assert not agent.validate_result([0], case)[0]
+
+
+def test_quality_check_without_numeric_expectation_passes(agent):
+    case = {"test_type": "quality_check", "expected_result": "no duplicates"}
+    passed, message = agent.validate_result([[{"n": 1}]], case)
+    assert passed
+    assert message.startswith("Query executed, results:")
+
+
+def test_expected_counts_checks_every_result(agent):
+    case = {"test_type": "scenario_check", "expected_counts": [1, 2, 0]}
+    assert agent.validate_result([[{"id": 1}], 2, []], case)[0]
+    # Only the middle result differs; a last-result check would miss it
+    assert agent.validate_result([[{"id": 1}], 3, []], case) == (
+        False, "Failed: Expected counts [1, 2, 0], Got [1, 3, 0]")
+
+
+def test_expected_counts_requires_one_count_per_result(agent):
+    case = {"test_type": "quality_check", "expected_counts": [1, 2]}
+    assert not agent.validate_result([1], case)[0]
+    assert not agent.validate_result([1, 2, 3], case)[0]
+
+
+def test_non_numeric_results_count_as_zero(agent):
+    case = {"test_type": "quality_check", "expected_counts": [0, 0]}
+    assert agent.validate_result([None, "ok"], case)[0]
+
+
+def test_scenario_check_reports_counts(agent):
+    case = {"test_type": "scenario_check", "expected_outcome": "customer is versioned"}
+    assert agent.validate_result([[{"id": 1}, {"id": 2}], 1], case) == (
+        True, "Validation passed: Found [2, 1] records across 2 queries")
+    assert agent.validate_result([], case) == (True, "Scenario executed: no validation queries")
@@ -12,10 +12,25 @@ SCD Type 2 tracks changes by:
 """
 
 import csv
+import logging
+from itertools import islice
+from operator import itemgetter
 import psycopg2
+from psycopg2.extras import execute_batch, execute_values
 from datetime import datetime
-from typing import List, Dict, Optional
-from utils.db_connection import DatabaseConnection
+from typing import Dict, Iterable, Iterator, List, Optional
+from utils.db_connection import DatabaseConnection, prepare_statements
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
+
+# Per-row SCD decisions are logged at DEBUG (silent by default); the load
+# summary stays on stdout
+logger = logging.getLogger(__name__)
 
 
 class CustomerSCD2ETL:
@@ -24,14 +39,145 @@ class CustomerSCD2ETL:
     Tracks changes in company_name field while maintaining full history.
     """
 
-    def __init__(self):
+    # Source columns, in staging/insert order
+    SOURCE_COLUMNS = ['customer_id', 'first_name', 'last_name', 'email', 'company_name', 'phone']
+
+    # Classifies staged rows against current dimension rows and applies all
+    # SCD2 expiries, SCD1 updates and inserts in one set-based statement
+    MERGE_STAGING_QUERY = """
+    WITH classified AS (
+        SELECT s.row_num, s.customer_id, s.first_name, s.last_name,
+               s.email, s.company_name, s.phone, d.surrogate_key,
+               CASE
+                   WHEN d.surrogate_key IS NULL THEN 'inserted'
+                   WHEN d.company_name IS DISTINCT FROM s.company_name THEN 'updated_scd2'
+                   WHEN (d.first_name, d.last_name, d.email, d.phone)
+                        IS DISTINCT FROM (s.first_name, s.last_name, s.email, s.phone)
+                       THEN 'updated_scd1'
+                   ELSE 'unchanged'
+               END AS change_type
+        FROM staging_customer s
+        LEFT JOIN dim_customer d
+               ON d.customer_id = s.customer_id AND d.is_current = TRUE
+    ),
+    expired AS (
+        UPDATE dim_customer d
+        SET effective_end_date = %(load_date)s,
+            is_current = FALSE,
+            updated_at = CURRENT_TIMESTAMP
+        FROM classified c
+        WHERE c.change_type = 'updated_scd2' AND d.surrogate_key = c.surrogate_key
+        RETURNING d.surrogate_key
+    ),
+    type1 AS (
+        UPDATE dim_customer d
+        SET first_name = c.first_name,
+            last_name = c.last_name,
+            email = c.email,
+            phone = c.phone,
+            updated_at = CURRENT_TIMESTAMP
+        FROM classified c
+        WHERE c.change_type = 'updated_scd1' AND d.surrogate_key = c.surrogate_key
+        RETURNING d.surrogate_key
+    ),
+    inserted AS (
+        INSERT INTO dim_customer
+            (customer_id, first_name, last_name, email, company_name, phone,
+             effective_start_date, effective_end_date, is_current)
+        SELECT customer_id, first_name, last_name, email, company_name, phone,
+               %(load_date)s, NULL, TRUE
+        FROM classified
+        WHERE change_type IN ('inserted', 'updated_scd2')
+        ORDER BY row_num
+        RETURNING surrogate_key
+    )
+    SELECT change_type, COUNT(*) FROM classified GROUP BY change_type;
+    """
+
+    # Rows buffered in memory per staging INSERT batch
+    STAGE_BATCH_SIZE = 5000
+
+    # Above this many keys the snapshot is loaded whole instead of filtered by ANY(%s)
+    SNAPSHOT_FILTER_LIMIT = 10000
+
+    # Row-level statements of the fallback load, prepared once per connection
+    ROW_STATEMENTS = {
+        "etl_insert_customer": """
+        INSERT INTO dim_customer
+            (customer_id, first_name, last_name, email, company_name, phone,
+             effective_start_date, effective_end_date, is_current)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+        """,
+        "etl_expire_customer": """
+        UPDATE dim_customer
+        SET effective_end_date = $1,
+            is_current = FALSE,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE surrogate_key = $2
+        """,
+        "etl_update_type1": """
+        UPDATE dim_customer
+        SET first_name = $1,
+            last_name = $2,
+            email = $3,
+            phone = $4,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE surrogate_key = $5
+        """
+    }
+
+    # Parameter tuples in ROW_STATEMENTS column order
+    _SOURCE_VALUES = itemgetter(*SOURCE_COLUMNS)
+    _TYPE1_VALUES = itemgetter('first_name', 'last_name', 'email', 'phone')
+
+    def __init__(self, verbose: bool = False):
         self.db = DatabaseConnection()
+        # Print the dimension table from display_current_state()
+        self.verbose = verbose
         self.conn = None
         self.cursor = None
         # Fields that trigger a new version when changed (SCD Type 2)
         self.tracked_fields = ['company_name']
         # Fields that update in place (SCD Type 1)
         self.type1_fields = ['first_name', 'last_name', 'email', 'phone']
+        # Tuple getters for comparing all tracked fields of a record at once
+        self._scd2_key = self._field_getter(self.tracked_fields)
+        self._scd1_key = self._field_getter(self.type1_fields)
+        # Statistics of the most recent load
+        self.last_stats = None
+
+    @staticmethod
+    def _field_getter(fields: List[str]):
+        """Return a callable mapping a record to the tuple of the given fields."""
+        getter = itemgetter(*fields)
+        if len(fields) == 1:
+            # itemgetter with one key returns the bare value, not a 1-tuple
+            return lambda record: (getter(record),)
+        return getter
+
+    def _classify(self, source_record: Dict, target_record: Optional[Dict]) -> str:
+        """
+        Classify a source record against the current version of its customer.
+        Each check is a single tuple comparison instead of a per-field loop.
+        
+        Args:
+            source_record: New record from source
+            target_record: Current record from target (None if the customer is new)
+            
+        Returns:
+            'inserted', 'updated_scd2', 'updated_scd1' or 'unchanged'
+        """
+        if target_record is None:
+            return 'inserted'
+        if self._scd2_key(source_record) != self._scd2_key(target_record):
+            return 'updated_scd2'
+        if self._scd1_key(source_record) != self._scd1_key(target_record):
+            return 'updated_scd1'
+        return 'unchanged'
+
+    def reset(self):
+        """Clear per-load state so one instance can be reused across loads."""
+        self.last_stats = None
 
     def connect(self):
         """Establish database connection."""
@@ -40,22 +186,28 @@ class CustomerSCD2ETL:
         print("Database connection established.")
 
     def close(self):
-        """Close database connection."""
+        """Return the database connection to the pool."""
         if self.conn:
-            self.conn.close()
-            print("Database connection closed.")
+            self.db.release(self.conn)
+            self.conn = None
+            self.cursor = None
+            print("Database connection released.")
 
-    def create_target_table(self):
+    def create_target_table(self, reset: bool = False):
         """
-        Create the customer dimension table with SCD Type 2 structure.
-        Drops existing table if present (for demo purposes).
+        Create the customer dimension table with SCD Type 2 structure
+        if it does not exist yet.
+        
+        Args:
+            reset: Drop the existing table (and its history) first; for
+                   demos and tests only
         """
         drop_table_query = """
         DROP TABLE IF EXISTS dim_customer;
         """
         
         create_table_query = """
-        CREATE TABLE dim_customer (
+        CREATE TABLE IF NOT EXISTS dim_customer (
             surrogate_key SERIAL PRIMARY KEY,
             customer_id VARCHAR(50) NOT NULL,
             first_name VARCHAR(100),
@@ -70,171 +222,260 @@ class CustomerSCD2ETL:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         
-        CREATE INDEX idx_customer_id ON dim_customer(customer_id);
-        CREATE INDEX idx_is_current ON dim_customer(is_current);
+        CREATE INDEX IF NOT EXISTS idx_customer_id ON dim_customer(customer_id);
+        -- Current-version lookups (snapshot, merge join) are index-only scans
+        CREATE INDEX IF NOT EXISTS idx_dim_customer_current ON dim_customer(customer_id)
+            INCLUDE (surrogate_key, first_name, last_name, email, company_name, phone)
+            WHERE is_current;
+        -- Superseded by idx_dim_customer_current; dropped on existing tables
+        DROP INDEX IF EXISTS idx_is_current;
         """
         
-        self.cursor.execute(drop_table_query)
+        if reset:
+            self.cursor.execute(drop_table_query)
         self.cursor.execute(create_table_query)
         self.conn.commit()
-        print("Target table 'dim_customer' created successfully.")
+        print("Target table 'dim_customer' is ready.")
 
-    def extract(self, file_path: str) -> List[Dict]:
+    def extract(self, file_path: str) -> Iterator[Dict]:
         """
-        Extract customer data from CSV file.
+        Extract customer data from CSV file, yielding records lazily so the
+        file is never held in memory as a whole.
         
         Args:
             file_path: Path to the source CSV file
             
-        Returns:
-            List of dictionaries containing customer records
+        Yields:
+            Dictionaries containing customer records
         """
-        records = []
-        with open(file_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                records.append(dict(row))
+        count = 0
+        if pa_csv is not None:
+            for row in self._extract_arrow(file_path):
+                count += 1
+                yield row
+        else:
+            with open(file_path, 'r', encoding='utf-8', newline='') as file:
+                for row in csv.DictReader(file):
+                    count += 1
+                    yield row
         
-        print(f"Extracted {len(records)} records from {file_path}")
-        return records
+        print(f"Extracted {count} records from {file_path}")
 
-    def get_current_record(self, customer_id: str) -> Optional[Dict]:
+    @staticmethod
+    def _extract_arrow(file_path: str) -> Iterator[Dict]:
         """
-        Retrieve the current active record for a customer.
+        Parse a CSV file with pyarrow's streaming C++ reader, one block at a time.
+        Every column is read as a string so rows match csv.DictReader output.
         
         Args:
-            customer_id: The business key for the customer
+            file_path: Path to the source CSV file
             
-        Returns:
-            Dictionary with current record or None if not found
+        Yields:
+            Dictionaries containing customer records
         """
-        query = """
-        SELECT surrogate_key, customer_id, first_name, last_name, 
-               email, company_name, phone, effective_start_date
-        FROM dim_customer
-        WHERE customer_id = %s AND is_current = TRUE
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+            header = next(csv.reader(file), [])
+        if not header:
+            return
+
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=1 << 20),
+            convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in header})
+        )
+        for batch in reader:
+            yield from batch.to_pylist()
+
+    def create_staging_table(self):
+        """
+        Create (or empty) the session-local staging table used by bulk loads.
+        A TEMP table keeps concurrent sessions from seeing each other's rows.
         """
-        self.cursor.execute(query, (customer_id,))
-        row = self.cursor.fetchone()
+        self.cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS staging_customer (
+            row_num BIGSERIAL,
+            customer_id TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            email TEXT,
+            company_name TEXT,
+            phone TEXT
+        );
+        """)
+        self.cursor.execute("TRUNCATE staging_customer RESTART IDENTITY;")
+
+    def extract_copy(self, file_path: str) -> Optional[int]:
+        """
+        Bulk-load a source CSV file into the staging table with COPY,
+        bypassing Python row parsing.
         
-        if row:
-            return {
-                'surrogate_key': row[0],
-                'customer_id': row[1],
-                'first_name': row[2],
-                'last_name': row[3],
-                'email': row[4],
-                'company_name': row[5],
-                'phone': row[6],
-                'effective_start_date': row[7]
-            }
-        return None
-
-    def has_scd2_change(self, source_record: Dict, target_record: Dict) -> bool:
-        """
-        Check if any SCD Type 2 tracked field has changed.
+        Args:
+            file_path: Path to the source CSV file
+            
+        Returns:
+            Number of staged rows, or None if the file has columns the
+            staging table does not know (use extract() + load() instead)
+        """
+        with open(file_path, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8-sig')]), [])
+            if not header or not set(header) <= set(self.SOURCE_COLUMNS):
+                return None
+
+            # Empty fields stay empty strings, matching csv.DictReader
+            columns = ', '.join(header)
+            self.create_staging_table()
+            self.cursor.copy_expert(
+                f"COPY staging_customer ({columns}) FROM STDIN "
+                f"WITH (FORMAT csv, FORCE_NOT_NULL ({columns}))",
+                file
+            )
+            row_count = self.cursor.rowcount
+
+        print(f"Staged {row_count} records from {file_path}")
+        return row_count
+
+    def stage_records(self, records: Iterable[Dict]) -> int:
+        """
+        Insert records into the staging table in batched statements.
+        Records are consumed STAGE_BATCH_SIZE at a time, so a lazy source
+        (e.g. extract()) streams into the database without being materialized.
         
         Args:
-            source_record: New record from source
-            target_record: Existing record from target
+            records: Iterable of source records
             
         Returns:
-            True if any tracked field changed, False otherwise
+            Number of staged rows
         """
-        for field in self.tracked_fields:
-            if source_record.get(field) != target_record.get(field):
-                return True
-        return False
-
-    def has_scd1_change(self, source_record: Dict, target_record: Dict) -> bool:
+        self.create_staging_table()
+        query = f"INSERT INTO staging_customer ({', '.join(self.SOURCE_COLUMNS)}) VALUES %s"
+        rows = (tuple(record.get(col) for col in self.SOURCE_COLUMNS) for record in records)
+        staged = 0
+        while True:
+            batch = list(islice(rows, self.STAGE_BATCH_SIZE))
+            if not batch:
+                break
+            execute_values(self.cursor, query, batch, page_size=1000)
+            staged += len(batch)
+        return staged
+
+    def load_records(self, records: Iterable[Dict], load_date: datetime = None, commit: bool = True) -> Dict:
         """
-        Check if any SCD Type 1 field has changed.
+        Load records with SCD Type 2 logic, without a source file.
         
         Args:
-            source_record: New record from source
-            target_record: Existing record from target
+            records: Iterable of source records to process
+            load_date: Date to use for effective dates (defaults to now)
+            commit: Commit the transaction when done
             
         Returns:
-            True if any Type 1 field changed, False otherwise
+            Load statistics
         """
-        for field in self.type1_fields:
-            if source_record.get(field) != target_record.get(field):
-                return True
-        return False
+        self.stage_records(records)
+        return self.merge_staging(load_date, commit=commit)
 
-    def insert_new_record(self, record: Dict, effective_date: datetime):
+    def merge_staging(self, load_date: datetime = None, commit: bool = True) -> Dict:
         """
-        Insert a new customer record.
+        Apply SCD Type 2 logic to the staged rows with set-based SQL.
+        Falls back to the row-by-row load when a customer appears more than
+        once in the batch, since each occurrence must see the previous one.
         
         Args:
-            record: Customer record to insert
-            effective_date: Start date for the record
-        """
-        insert_query = """
-        INSERT INTO dim_customer 
-            (customer_id, first_name, last_name, email, company_name, phone,
-             effective_start_date, effective_end_date, is_current)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, NULL, TRUE)
+            load_date: Date to use for effective dates (defaults to now)
+            commit: Commit the transaction when done
+            
+        Returns:
+            Load statistics
         """
-        self.cursor.execute(insert_query, (
-            record['customer_id'],
-            record['first_name'],
-            record['last_name'],
-            record['email'],
-            record['company_name'],
-            record['phone'],
-            effective_date
-        ))
+        if load_date is None:
+            load_date = datetime.now()
+
+        self.cursor.execute("""
+        SELECT EXISTS (
+            SELECT 1 FROM staging_customer GROUP BY customer_id HAVING COUNT(*) > 1
+        );
+        """)
+        if self.cursor.fetchone()[0]:
+            self.cursor.execute(
+                f"SELECT {', '.join(self.SOURCE_COLUMNS)} FROM staging_customer ORDER BY row_num;"
+            )
+            records = [dict(zip(self.SOURCE_COLUMNS, row)) for row in self.cursor.fetchall()]
+            return self._load_rows(records, load_date, commit=commit)
+
+        self.cursor.execute(self.MERGE_STAGING_QUERY, {'load_date': load_date})
+        stats = {
+            'inserted': 0,
+            'updated_scd2': 0,
+            'updated_scd1': 0,
+            'unchanged': 0
+        }
+        for change_type, count in self.cursor.fetchall():
+            stats[change_type] = count
+
+        if commit:
+            self.conn.commit()
+
+        print(f"\nLoad Summary:")
+        print(f"  - New records inserted: {stats['inserted']}")
+        print(f"  - SCD2 updates (new versions): {stats['updated_scd2']}")
+        print(f"  - SCD1 updates (in-place): {stats['updated_scd1']}")
+        print(f"  - Unchanged records: {stats['unchanged']}")
 
-    def expire_record(self, surrogate_key: int, effective_date: datetime):
+        self.last_stats = stats
+        return stats
+
+    def load(self, records: Iterable[Dict], load_date: datetime = None, commit: bool = True):
         """
-        Expire an existing record by setting end date and is_current flag.
+        Load records into target table implementing SCD Type 2 logic.
+        Records are staged in batches and merged with set-based SQL, so the
+        number of round-trips no longer grows with the number of customers.
         
         Args:
-            surrogate_key: Primary key of record to expire
-            effective_date: End date for the record
-        """
-        update_query = """
-        UPDATE dim_customer
-        SET effective_end_date = %s,
-            is_current = FALSE,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE surrogate_key = %s
+            records: Iterable of source records to process (e.g. extract())
+            load_date: Date to use for effective dates (defaults to now)
+            commit: Commit the transaction when done (False lets the caller
+                    keep the changes inside an open transaction/savepoint)
         """
-        self.cursor.execute(update_query, (effective_date, surrogate_key))
+        return self.load_records(records, load_date, commit=commit)
 
-    def update_type1_fields(self, surrogate_key: int, record: Dict):
+    def _load_current_snapshot(self, customer_ids=None) -> Dict[str, Dict]:
         """
-        Update SCD Type 1 fields in place.
+        Retrieve current active records in one streamed query, for an
+        in-memory hash join against the source batch. Rows arrive through a
+        server-side cursor in itersize batches.
         
         Args:
-            surrogate_key: Primary key of record to update
-            record: Source record with new values
-        """
-        update_query = """
-        UPDATE dim_customer
-        SET first_name = %s,
-            last_name = %s,
-            email = %s,
-            phone = %s,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE surrogate_key = %s
+            customer_ids: Business keys to look up; the whole current snapshot
+                          is loaded when None or when there are more than
+                          SNAPSHOT_FILTER_LIMIT keys (a scan beats a huge ANY probe)
+            
+        Returns:
+            Mapping of customer_id to its current record
         """
-        self.cursor.execute(update_query, (
-            record['first_name'],
-            record['last_name'],
-            record['email'],
-            record['phone'],
-            surrogate_key
-        ))
-
-    def load(self, records: List[Dict], load_date: datetime = None):
+        columns = ['surrogate_key', 'customer_id', 'first_name', 'last_name',
+                   'email', 'company_name', 'phone']
+        query = f"SELECT {', '.join(columns)} FROM dim_customer WHERE is_current = TRUE"
+        params = None
+        if customer_ids is not None and len(customer_ids) <= self.SNAPSHOT_FILTER_LIMIT:
+            query += " AND customer_id = ANY(%s)"
+            params = (list(customer_ids),)
+
+        with self.conn.cursor(name='dim_customer_snapshot') as cur:
+            cur.itersize = 10000
+            cur.execute(query, params)
+            return {row[1]: dict(zip(columns, row)) for row in cur}
+
+    def _load_rows(self, records: List[Dict], load_date: datetime = None, commit: bool = True):
         """
-        Load records into target table implementing SCD Type 2 logic.
+        Row-level SCD Type 2 load, used when a customer appears more than
+        once in a batch and each occurrence must see the previous one.
+        Current records are fetched in one query and the batch is replayed
+        in memory; the resulting writes go out as prepared statements via
+        execute_batch instead of one round-trip per row.
         
         Args:
             records: List of source records to process
             load_date: Date to use for effective dates (defaults to now)
+            commit: Commit the transaction when done
         """
         if load_date is None:
             load_date = datetime.now()
@@ -246,33 +487,67 @@ class CustomerSCD2ETL:
             'unchanged': 0
         }
 
+        current = self._load_current_snapshot({record['customer_id'] for record in records})
+        to_expire = []       # surrogate keys of stored versions to close
+        to_update_t1 = {}    # surrogate key -> latest Type 1 values
+        to_insert = []       # new versions in source order (mutable until written)
+
         for record in records:
-            existing = self.get_current_record(record['customer_id'])
+            customer_id = record['customer_id']
+            existing = current.get(customer_id)
+            change = self._classify(record, existing)
 
-            if existing is None:
+            if change == 'inserted':
                 # New customer - insert
-                self.insert_new_record(record, load_date)
                 stats['inserted'] += 1
-                print(f"  INSERT: New customer {record['customer_id']}")
+                logger.debug("  INSERT: New customer %s", customer_id)
 
-            elif self.has_scd2_change(record, existing):
+            elif change == 'updated_scd2':
                 # SCD Type 2 change detected - expire old and insert new
-                self.expire_record(existing['surrogate_key'], load_date)
-                self.insert_new_record(record, load_date)
+                if 'pending' in existing:
+                    # The old version is itself new in this batch: write it already closed
+                    to_insert[existing['pending']][7:9] = [load_date, False]
+                else:
+                    to_expire.append((load_date, existing['surrogate_key']))
                 stats['updated_scd2'] += 1
-                print(f"  SCD2 UPDATE: Customer {record['customer_id']} - "
-                      f"company changed from '{existing['company_name']}' to '{record['company_name']}'")
+                logger.debug("  SCD2 UPDATE: Customer %s - company changed from '%s' to '%s'",
+                             customer_id, existing['company_name'], record['company_name'])
 
-            elif self.has_scd1_change(record, existing):
+            elif change == 'updated_scd1':
                 # SCD Type 1 change - update in place
-                self.update_type1_fields(existing['surrogate_key'], record)
+                type1_values = list(self._TYPE1_VALUES(record))
+                if 'pending' in existing:
+                    row = to_insert[existing['pending']]
+                    row[1:4] = type1_values[:3]
+                    row[5] = type1_values[3]
+                else:
+                    to_update_t1[existing['surrogate_key']] = (*type1_values, existing['surrogate_key'])
+                existing.update(zip(self.type1_fields, type1_values))
                 stats['updated_scd1'] += 1
-                print(f"  SCD1 UPDATE: Customer {record['customer_id']} - attributes updated")
+                logger.debug("  SCD1 UPDATE: Customer %s - attributes updated", customer_id)
+                continue
 
             else:
                 stats['unchanged'] += 1
-
-        self.conn.commit()
+                continue
+
+            # The record becomes the customer's current version
+            current[customer_id] = dict(record, pending=len(to_insert))
+            to_insert.append([*self._SOURCE_VALUES(record), load_date, None, True])
+
+        prepare_statements(self.cursor, self.ROW_STATEMENTS)
+        if to_expire:
+            execute_batch(self.cursor, "EXECUTE etl_expire_customer (%s, %s)",
+                          to_expire, page_size=1000)
+        if to_update_t1:
+            execute_batch(self.cursor, "EXECUTE etl_update_type1 (%s, %s, %s, %s, %s)",
+                          list(to_update_t1.values()), page_size=1000)
+        if to_insert:
+            execute_batch(self.cursor, "EXECUTE etl_insert_customer (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                          to_insert, page_size=1000)
+
+        if commit:
+            self.conn.commit()
         
         print(f"\nLoad Summary:")
         print(f"  - New records inserted: {stats['inserted']}")
@@ -280,6 +555,7 @@ class CustomerSCD2ETL:
         print(f"  - SCD1 updates (in-place): {stats['updated_scd1']}")
         print(f"  - Unchanged records: {stats['unchanged']}")
 
+        self.last_stats = stats
         return stats
 
     def run_etl(self, source_file: str, load_date: datetime = None):
@@ -294,14 +570,22 @@ class CustomerSCD2ETL:
         print(f"Starting ETL Process: {source_file}")
         print(f"{'='*60}\n")
 
-        # Extract
-        records = self.extract(source_file)
+        # Extract: COPY the file straight into staging when its columns are known
+        if self.extract_copy(source_file) is not None:
+            # Load with SCD Type 2 (set-based merge of the staged rows)
+            stats = self.merge_staging(load_date)
+        else:
+            records = self.extract(source_file)
 
-        # Transform (minimal transformation for this example)
-        # In real scenarios, you might add data cleansing, validation, etc.
+            # Transform (minimal transformation for this example)
+            # In real scenarios, you might add data cleansing, validation, etc.
 
-        # Load with SCD Type 2
-        stats = self.load(records, load_date)
+            # Load with SCD Type 2
+            stats = self.load(records, load_date)
+
+        # Refresh planner statistics after the bulk change
+        self.cursor.execute("ANALYZE dim_customer")
+        self.conn.commit()
 
         print(f"\n{'='*60}")
         print("ETL Process Completed")
@@ -310,23 +594,30 @@ class CustomerSCD2ETL:
         return stats
 
     def display_current_state(self):
-        """Display all records in the dimension table for verification."""
+        """
+        Display all records in the dimension table for verification.
+        Rows are streamed through a server-side cursor and printed as they
+        arrive; does nothing unless the ETL was created with verbose=True.
+        """
+        if not self.verbose:
+            return
+
         query = """
         SELECT surrogate_key, customer_id, first_name, last_name, 
                company_name, effective_start_date, effective_end_date, is_current
         FROM dim_customer
         ORDER BY customer_id, effective_start_date
         """
-        self.cursor.execute(query)
-        rows = self.cursor.fetchall()
-
         print(f"\n{'='*100}")
         print("Current State of dim_customer Table")
         print(f"{'='*100}")
         print(f"{'SK':<5} {'Cust ID':<10} {'Name':<20} {'Company':<25} {'Start Date':<20} {'End Date':<20} {'Current'}")
         print(f"{'-'*100}")
         
-        for row in rows:
-            end_date = str(row[6])[:19] if row[6] else 'NULL'
-            start_date = str(row[5])[:19] if row[5] else 'NULL'
-            print(f"{row[0]:<5} {row[1]:<10} {row[2]+' '+row[3]:<20} {row[4]:<25} {start_date:<20} {end_date:<20} {row[7]}")
+        with self.conn.cursor(name='dim_customer_display') as cur:
+            cur.itersize = 1000
+            cur.execute(query)
+            for row in cur:
+                end_date = str(row[6])[:19] if row[6] else 'NULL'
+                start_date = str(row[5])[:19] if row[5] else 'NULL'
+                print(f"{row[0]:<5} {row[1]:<10} {row[2]+' '+row[3]:<20} {row[4]:<25} {start_date:<20} {end_date:<20} {row[7]}")
@@ -1,28 +1,146 @@
 import psycopg2
+import psycopg2.pool
 import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Pool sizing defaults to the parallel test execution worker count
+_DEFAULT_WORKERS = int(os.getenv("TEST_EXECUTION_WORKERS", "4"))
+POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN", str(_DEFAULT_WORKERS)))
+POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX", str(2 * _DEFAULT_WORKERS)))
+# Seconds getconn() waits for a free connection before raising PoolError
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "60"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DBConfig:
+    """Connection settings, read from the environment once at import."""
+    host: Optional[str]
+    database: Optional[str]
+    user: Optional[str]
+    password: Optional[str]
+    sslmode: str = "require"
+
+    @classmethod
+    def from_env(cls) -> "DBConfig":
+        """Build the config from the DB_* environment variables."""
+        return cls(
+            host=os.getenv("DB_HOST"),
+            database=os.getenv("DB_NAME"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            sslmode=os.getenv("DB_SSLMODE", "require")
+        )
+
+
+DB_CONFIG = DBConfig.from_env()
+
+
+class BlockingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool whose getconn() waits for a connection to be
+    returned instead of raising PoolError as soon as maxconn are in use.
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout: float = POOL_TIMEOUT, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        """Borrow a connection, waiting up to timeout seconds for a free slot."""
+        if not self._slots.acquire(timeout=self._timeout):
+            raise psycopg2.pool.PoolError(
+                f"no connection available within {self._timeout}s (maxconn={self.maxconn})"
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        """Return a connection and free its slot for a waiting borrower."""
+        super().putconn(conn, key, close)
+        self._slots.release()
+
+
 class DatabaseConnection:
-    def __init__(self):
-        self.host = os.getenv("DB_HOST")
-        self.database = os.getenv("DB_NAME")
-        self.user = os.getenv("DB_USER")
-        self.password = os.getenv("DB_PASSWORD")
-        self.sslmode = os.getenv("DB_SSLMODE", "require")
+    def __init__(self, config: DBConfig = DB_CONFIG):
+        self.config = config
+        self.host = config.host
+        self.database = config.database
+        self.user = config.user
+        self.password = config.password
+        self.sslmode = config.sslmode
 
     def get_connection(self):
+        """
+        Borrow a connection from the process-wide pool, skipping a fresh
+        TCP + TLS handshake per caller. Hand it back with release().
+        """
         try:
-            conn = psycopg2.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                sslmode=self.sslmode
-            )
-            return conn
+            return get_pool().getconn()
         except psycopg2.Error as e:
             print(f"Connection failed: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def release(self, conn):
+        """
+        Return a borrowed connection to the pool. An open transaction is
+        rolled back by the pool; a broken connection is discarded.
+
+        Args:
+            conn: Connection obtained from get_connection()
+        """
+        get_pool().putconn(conn, close=bool(conn.closed))
+
+
+def get_pool():
+    """
+    Return the process-wide connection pool, creating it on first use.
+    Connections are shared between threads via getconn()/putconn(); when
+    all are in use, getconn() blocks until one is returned.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BlockingConnectionPool(
+                    minconn=POOL_MIN_CONN,
+                    maxconn=max(POOL_MIN_CONN, POOL_MAX_CONN),
+                    **asdict(DB_CONFIG)
+                )
+    return _pool
+
+
+def prepare_statements(cursor, statements, prepared=None):
+    """
+    PREPARE named server-side statements that do not exist yet on the
+    cursor's connection. Pooled connections keep prepared statements
+    between checkouts, so existing names are looked up once and skipped.
+
+    Args:
+        cursor: Tuple cursor of the target connection
+        statements: Mapping of statement name to SQL body
+        prepared: Names already known to be prepared (skips the lookup)
+
+    Returns:
+        Set of statement names prepared on the connection
+    """
+    if prepared is None:
+        cursor.execute("SELECT name FROM pg_prepared_statements;")
+        prepared = {row[0] for row in cursor.fetchall()}
+    for name, query in statements.items():
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {query};")
+            prepared.add(name)
+    return prepared
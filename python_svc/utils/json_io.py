@@ -0,0 +1,194 @@
+"""
+JSON I/O Utilities
+==================
+This module provides JSON encode/decode helpers that use the C-accelerated
+orjson package when it is installed and fall back to the standard library
+json module otherwise, plus an incremental parser for streamed JSON arrays.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON bytes.
+    Values without a native JSON representation (e.g. Decimal) are stringified.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option, default=str)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def dump_to_file(obj, path: str, indent: bool = False):
+    """
+    Atomically write an object as JSON: the document is serialized in
+    memory, written to a temp file in one call, fsynced and swapped into
+    place, so a crash leaves either the old or the new file, never a torn one.
+
+    Args:
+        obj: Object to serialize
+        path: Destination file path
+        indent: Pretty-print with two-space indentation
+    """
+    data = dumps(obj, indent=indent)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb', buffering=0) as f:
+        f.write(data)
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def loads(data):
+    """
+    Deserialize JSON from bytes or str.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _JSONContainerStream:
+    """
+    Base class for incremental parsers of a top-level JSON container fed as
+    streamed text chunks. Text before the opening bracket (e.g. a markdown
+    fence) is skipped, and each member is returned as soon as it is complete.
+    """
+
+    OPEN = None
+    CLOSE = None
+
+    def __init__(self):
+        self.done = False
+        self._chunks = []
+        self._buffer = ''
+        self._started = False
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return ''.join(self._chunks)
+
+    def feed(self, chunk: str) -> list:
+        """
+        Add a chunk of text and parse any members it completes.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            List of newly completed members
+        """
+        self._chunks.append(chunk)
+        if self.done:
+            return []
+
+        # Only the unparsed tail (at most one partial member) is buffered
+        self._buffer += chunk
+        if not self._started:
+            start = self._buffer.find(self.OPEN)
+            if start < 0:
+                return []
+            self._buffer = self._buffer[start + 1:]
+            self._started = True
+        elif '}' not in chunk and ']' not in chunk:
+            # No member can have been completed by this chunk
+            return []
+
+        members = []
+        buf = self._buffer
+        pos = 0
+        while True:
+            pos = self._skip_separators(buf, pos)
+            if pos >= len(buf):
+                break
+            if buf[pos] == self.CLOSE:
+                self.done = True
+                pos += 1
+                break
+            parsed = self._parse_member(buf, pos)
+            if parsed is None:
+                break  # Incomplete member, wait for more text
+            member, pos = parsed
+            members.append(member)
+
+        self._buffer = buf[pos:]
+        return members
+
+    @staticmethod
+    def _skip_separators(buf: str, pos: int) -> int:
+        """Advance past whitespace and commas between members."""
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        return pos
+
+    @staticmethod
+    def _skip_whitespace(buf: str, pos: int) -> int:
+        """Advance past whitespace."""
+        while pos < len(buf) and buf[pos] in ' \t\r\n':
+            pos += 1
+        return pos
+
+    def _decode_value(self, buf: str, pos: int):
+        """Decode one complete JSON value at pos, or return None if incomplete."""
+        try:
+            value, end = self._decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            return None
+        if end >= len(buf) and not isinstance(value, (dict, list, str)):
+            return None  # A trailing number/literal may still be growing
+        return value, end
+
+    def _parse_member(self, buf: str, pos: int):
+        raise NotImplementedError
+
+
+class JSONArrayStream(_JSONContainerStream):
+    """Incrementally parse the items of a streamed JSON array."""
+
+    OPEN = '['
+    CLOSE = ']'
+
+    def _parse_member(self, buf: str, pos: int):
+        return self._decode_value(buf, pos)
+
+
+class JSONObjectStream(_JSONContainerStream):
+    """Incrementally parse the (key, value) members of a streamed JSON object."""
+
+    OPEN = '{'
+    CLOSE = '}'
+
+    def _parse_member(self, buf: str, pos: int):
+        key = self._decode_value(buf, pos)
+        if key is None:
+            return None
+        key, pos = key
+        pos = self._skip_whitespace(buf, pos)
+        if pos >= len(buf) or buf[pos] != ':':
+            return None
+        value = self._decode_value(buf, self._skip_whitespace(buf, pos + 1))
+        if value is None:
+            return None
+        value, end = value
+        return (key, value), end
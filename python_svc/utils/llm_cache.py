@@ -0,0 +1,235 @@
+"""
+LLM Cache Utilities
+===================
+This module provides a two-tier cache for LLM outputs: an in-memory LRU
+in front of a persistent sqlite3 store, so repeat runs with identical
+inputs skip the OpenAI round-trip entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Default location for persistent cache files
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+
+# Every LLMCache created in this process, for llm_cache_stats()
+_CACHES = []
+
+# LLM_CACHE_DISABLE=1 turns every lookup into a miss, so each call reaches
+# the API; fresh responses are still stored for later runs
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLE", "0").lower() not in ("", "0", "false", "no")
+
+
+def _digest(data: str) -> str:
+    """Hex blake2b digest (32 bytes) of a string; cheaper than sha256 in CPython."""
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=32).hexdigest()
+
+
+def make_cache_key(payload: Any) -> str:
+    """
+    Build a deterministic cache key from a JSON-serializable payload.
+
+    Args:
+        payload: Any JSON-serializable object (dict keys are sorted)
+
+    Returns:
+        Hex-encoded blake2b digest
+    """
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return _digest(data)
+
+
+class LLMCache:
+    """
+    Exact-match cache for LLM results keyed by a content hash.
+    Values must be JSON-serializable.
+    """
+
+    def __init__(self, db_path: str, maxsize: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the sqlite3 database backing the cache
+            maxsize: Maximum number of entries kept in memory
+        """
+        self.db_path = db_path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._initialized = False
+        _CACHES.append(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the backing store, creating it on first use."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _remember(self, key: str, value: Any):
+        """Store a value in the in-memory LRU, evicting the oldest entry."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None on a miss
+        """
+        if LLM_CACHE_DISABLED:
+            self.misses += 1
+            return None
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value = json.loads(row[0])
+            self._remember(key, value)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value in both the in-memory and persistent tiers.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        data = json.dumps(value, default=str)
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)", (key, data))
+                conn.commit()
+            finally:
+                conn.close()
+            self._remember(key, value)
+
+
+def llm_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Report hit/miss counters of every LLMCache used in this process.
+
+    Returns:
+        Mapping of cache database file name to hits, misses and hit_rate
+    """
+    stats = {}
+    for cache in _CACHES:
+        lookups = cache.hits + cache.misses
+        stats[os.path.basename(cache.db_path)] = {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": round(cache.hits / lookups, 3) if lookups else 0.0
+        }
+    return stats
+
+
+class SemanticCache:
+    """
+    Similarity-based fallback cache. Reuses a stored value when the
+    embedding of a new text is within a cosine threshold of a cached one.
+    Requires the optional sentence-transformers package.
+    """
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', threshold: float = 0.95, maxsize: int = 512):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum number of stored entries
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._model = None
+        self._entries = []
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """True if sentence-transformers is installed."""
+        return SentenceTransformer is not None
+
+    def embed(self, text: str) -> List[float]:
+        """Compute a normalized embedding for the given text."""
+        with self._lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def get(self, embedding) -> Optional[Any]:
+        """
+        Return the value of the most similar entry above the threshold.
+
+        Args:
+            embedding: Normalized embedding from embed()
+
+        Returns:
+            Cached value or None on a miss
+        """
+        if LLM_CACHE_DISABLED:
+            self.misses += 1
+            return None
+        with self._lock:
+            best_score, best_value = 0.0, None
+            for cached_embedding, value in self._entries:
+                score = float(embedding @ cached_embedding)
+                if score > best_score:
+                    best_score, best_value = score, value
+
+            if best_score >= self.threshold:
+                self.hits += 1
+                return best_value
+            self.misses += 1
+            return None
+
+    def add(self, embedding, value: Any):
+        """Store a value under the given embedding."""
+        with self._lock:
+            self._entries.append((embedding, value))
+            if len(self._entries) > self.maxsize:
+                self._entries.pop(0)
+
@@ -1,4 +1,6 @@
-from openai import OpenAI
+import asyncio
+import time
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
 import os
 from dotenv import load_dotenv
 
@@ -6,21 +8,127 @@ load_dotenv()
 # Set your OpenAI API key (recommended: use environment variable)
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def call_openai_llm(prompt, model="gpt-3.5-turbo", max_tokens=256, temperature=0.7):
+# Transient API errors worth retrying (APITimeoutError is an APIConnectionError)
+RETRYABLE_LLM_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Async client, bound to the event loop it was created on
+_async_client = None
+_async_client_loop = None
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket limiting async callers to a number of requests per minute.
+    Allows bursts up to one minute's budget, then refills continuously.
+    """
+
+    def __init__(self, requests_per_minute):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, float(requests_per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _request_kwargs(prompt, model, max_tokens, temperature, prompt_cache_key, response_format=None):
+    """Build the chat completion request shared by the sync and async callers."""
+    kwargs = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    if prompt_cache_key:
+        kwargs["prompt_cache_key"] = prompt_cache_key
+    if response_format:
+        kwargs["response_format"] = response_format
+    return kwargs
+
+
+def _get_async_client():
+    """Return an AsyncOpenAI client for the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        _async_client_loop = loop
+    return _async_client
+
+
+def call_openai_llm(prompt, model="gpt-3.5-turbo", max_tokens=256, temperature=0.7, prompt_cache_key=None,
+                    response_format=None):
     """
     Calls the OpenAI LLM API with the given prompt.
+    Pass prompt_cache_key to route prompts sharing a prefix to the provider's prompt cache,
+    and response_format={"type": "json_object"} to get syntactically valid JSON back.
     Returns the response text.
     """
     response = client.chat.completions.create(
-        model=model,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=max_tokens,
-        temperature=temperature
+        **_request_kwargs(prompt, model, max_tokens, temperature, prompt_cache_key, response_format)
     )
     return response.choices[0].message.content.strip()
 
+
+async def acall_openai_llm(prompt, model="gpt-3.5-turbo", max_tokens=256, temperature=0.7, prompt_cache_key=None,
+                           response_format=None):
+    """
+    Async variant of call_openai_llm, so independent prompts can be awaited concurrently.
+    Returns the response text.
+    """
+    response = await _get_async_client().chat.completions.create(
+        **_request_kwargs(prompt, model, max_tokens, temperature, prompt_cache_key, response_format)
+    )
+    return response.choices[0].message.content.strip()
+
+
+async def astream_openai_llm(prompt, model="gpt-3.5-turbo", max_tokens=256, temperature=0.7, prompt_cache_key=None,
+                             response_format=None):
+    """
+    Streams the response of the OpenAI LLM API.
+    Yields response text deltas as they arrive.
+    """
+    stream = await _get_async_client().chat.completions.create(
+        stream=True,
+        **_request_kwargs(prompt, model, max_tokens, temperature, prompt_cache_key, response_format)
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def call_many(prompts, model="gpt-3.5-turbo", max_tokens=256, temperature=0.7, prompt_cache_key=None,
+                    response_format=None, max_concurrency=None, return_exceptions=False):
+    """
+    Sends independent prompts concurrently with acall_openai_llm and gathers the results,
+    so N requests cost roughly one round-trip of latency instead of N.
+    Pass max_concurrency to cap in-flight requests, and return_exceptions=True to get
+    failures back in place of their responses instead of raising.
+    Returns the response texts in prompt order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def call_one(prompt):
+        if semaphore is None:
+            return await acall_openai_llm(prompt, model, max_tokens, temperature, prompt_cache_key, response_format)
+        async with semaphore:
+            return await acall_openai_llm(prompt, model, max_tokens, temperature, prompt_cache_key, response_format)
+
+    return await asyncio.gather(*(call_one(prompt) for prompt in prompts), return_exceptions=return_exceptions)
+
 if __name__ == "__main__":
     test_prompt = "Explain the theory of relativity in simple terms."
     response = call_openai_llm(test_prompt)
     print("Response from OpenAI LLM:")
-    print(response)
\ No newline at end of file
+    print(response)